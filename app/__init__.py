@@ -1,7 +1,7 @@
 # app/__init__.py
 from flask import Flask
 from config import Config
-from .extensions import db, migrate, jwt, cors
+from .extensions import db, migrate, jwt, cors, cache, carts
 
 
 def create_app(config_class=None):
@@ -13,6 +13,8 @@ def create_app(config_class=None):
     migrate.init_app(app, db)
     jwt.init_app(app)
     cors.init_app(app)
+    cache.init_app(app)
+    carts.init_app(app)
 
     # register Blueprints
     from app.routes.auth_routes import auth_bp
@@ -22,4 +24,8 @@ def create_app(config_class=None):
     app.register_blueprint(menu_bp, url_prefix='/api/menu')
     app.register_blueprint(order_bp, url_prefix='/api/order')
 
+    # register CLI commands
+    from app.commands import register_commands
+    register_commands(app)
+
     return app
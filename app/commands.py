@@ -0,0 +1,170 @@
+# app/commands.py
+import click
+from flask.cli import AppGroup
+
+search_cli = AppGroup("search", help="Full-text search index maintenance")
+
+
+@search_cli.command("rebuild")
+def rebuild_search_index_command():
+    """Rebuild the menu full-text search index from scratch"""
+    from app.utils.search import rebuild_search_index
+
+    indexed = rebuild_search_index()
+    click.echo(f"Indexed {indexed} menu items")
+
+
+images_cli = AppGroup("images", help="Uploaded menu image maintenance")
+
+
+@images_cli.command("variants")
+def generate_image_variants_command():
+    """Generate missing WebP variants for uploaded menu images"""
+    from flask import current_app
+    from app.extensions import db
+    from app.models import MenuItem
+    from app.utils.image_processing import (
+        UPLOAD_URL_PREFIX, generate_image_variants, record_image_variants, upload_path
+    )
+
+    image_urls = [
+        image_url for (image_url,) in db.session.query(MenuItem.image_url)
+        .filter(MenuItem.image_url.startswith(UPLOAD_URL_PREFIX), MenuItem.image_variants.is_(None))
+        .distinct()
+    ]
+
+    sizes = current_app.config['IMAGE_VARIANT_SIZES']
+    quality = current_app.config['IMAGE_VARIANT_QUALITY']
+    generated = 0
+    for image_url in image_urls:
+        try:
+            variants = generate_image_variants(upload_path(image_url), sizes, quality)
+        except (OSError, ValueError) as e:
+            click.echo(f"Skipping {image_url}: {e}", err=True)
+            continue
+        record_image_variants(image_url, variants)
+        generated += 1
+
+    click.echo(f"Generated variants for {generated} of {len(image_urls)} images")
+
+
+uploads_cli = AppGroup("uploads", help="Uploaded file maintenance")
+
+
+@uploads_cli.command("gc")
+@click.option("--grace-hours", type=float, default=None,
+              help="Keep orphans younger than this (default UPLOAD_GC_GRACE_HOURS)")
+@click.option("--batch-size", type=int, default=500, show_default=True)
+@click.option("--dry-run", is_flag=True, help="Only report what would be deleted")
+def collect_upload_garbage_command(grace_hours, batch_size, dry_run):
+    """Delete uploaded images no menu item references any more"""
+    from flask import current_app
+    from app.utils.upload_gc import collect_upload_garbage
+
+    if grace_hours is None:
+        grace_hours = current_app.config.get('UPLOAD_GC_GRACE_HOURS', 24)
+
+    stats = collect_upload_garbage(grace_hours=grace_hours, dry_run=dry_run, batch_size=batch_size)
+    action = "would delete" if dry_run else "deleted"
+    deleted = stats['orphaned'] if dry_run else stats['deleted']
+    click.echo(f"Scanned {stats['scanned']} files, {action} {deleted} orphans "
+               f"({stats['freed_bytes'] / (1024 * 1024):.1f} MB)")
+
+
+rankings_cli = AppGroup("rankings", help="Trending/recommended menu rankings")
+
+
+@rankings_cli.command("refresh")
+def refresh_rankings_command():
+    """Recompute the ranked lists from the daily order buckets (run from cron)"""
+    from app.utils.rankings import refresh_menu_rankings
+
+    refresh_menu_rankings()
+    click.echo("Menu rankings refreshed")
+
+
+@rankings_cli.command("rebuild")
+def rebuild_rankings_command():
+    """Rebuild the daily order buckets from order history, then refresh"""
+    from app.utils.rankings import rebuild_daily_orders, refresh_menu_rankings
+
+    buckets = rebuild_daily_orders()
+    refresh_menu_rankings()
+    click.echo(f"Rebuilt {buckets} daily buckets and refreshed menu rankings")
+
+
+suggestions_cli = AppGroup("suggestions", help="Frequently-ordered-together suggestions")
+
+
+@suggestions_cli.command("rebuild")
+def rebuild_suggestions_command():
+    """Recount item pairs from completed orders and rebuild the neighbour lists"""
+    from app.utils.recommendations import rebuild_item_neighbours
+
+    items = rebuild_item_neighbours()
+    click.echo(f"Rebuilt neighbour lists for {items} menu items")
+
+
+carts_cli = AppGroup("carts", help="Cart store maintenance")
+
+
+@carts_cli.command("import-drafts")
+@click.option("--batch-size", type=int, default=500, show_default=True)
+def import_draft_carts_command(batch_size):
+    """Move carts stored as DRAFT orders into the cart store"""
+    from app.utils.cart_store import import_draft_orders
+
+    moved = import_draft_orders(batch_size=batch_size)
+    click.echo(f"Moved {moved} draft orders into the cart store")
+
+
+stats_cli = AppGroup("stats", help="Caterer order statistics rollups")
+
+
+@stats_cli.command("rebuild")
+def rebuild_stats_command():
+    """Rebuild the caterer daily stats from order history"""
+    from app.utils.order_stats import rebuild_caterer_daily_stats
+
+    rows = rebuild_caterer_daily_stats()
+    click.echo(f"Rebuilt {rows} caterer daily stats rows")
+
+
+queries_cli = AppGroup("queries", help="Query plan checks")
+
+
+@queries_cli.command("explain")
+@click.option("--orders", type=int, default=200000, show_default=True, help="Orders to seed")
+@click.option("--clients", type=int, default=5000, show_default=True)
+@click.option("--caterers", type=int, default=200, show_default=True)
+@click.option("--verbose", is_flag=True, help="Print every plan")
+def explain_queries_command(orders, clients, caterers, verbose):
+    """
+    Seed a large order history, EXPLAIN the hot order queries and fail
+    if one reads orders/order_items with a sequential scan. The seed is rolled
+    back, but run it against a scratch database migrated to head.
+    """
+    from app.utils.query_plans import check_query_plans
+
+    results = check_query_plans(orders=orders, clients=clients, caterers=caterers)
+    regressed = [name for name, scans, _ in results if scans]
+    for name, scans, plan in results:
+        status = f"SEQ SCAN on {', '.join(scans)}" if scans else "ok"
+        click.echo(f"{name}: {status}")
+        if verbose or scans:
+            click.echo(plan)
+
+    if regressed:
+        raise click.ClickException(f"{len(regressed)} hot queries use a sequential scan: {', '.join(regressed)}")
+    click.echo(f"All {len(results)} hot queries use an index")
+
+
+def register_commands(app):
+    app.cli.add_command(search_cli)
+    app.cli.add_command(images_cli)
+    app.cli.add_command(uploads_cli)
+    app.cli.add_command(rankings_cli)
+    app.cli.add_command(suggestions_cli)
+    app.cli.add_command(carts_cli)
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(queries_cli)
@@ -3,8 +3,12 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
+from app.utils.cache import ResponseCache
+from app.utils.cart_store import CartStore
 
 db = SQLAlchemy()
 migrate = Migrate()
 jwt = JWTManager()
 cors = CORS()
+cache = ResponseCache()
+carts = CartStore()
@@ -155,6 +155,7 @@ from datetime import datetime, timedelta  # ADD timedelta here ✅
 import enum
 import uuid  # ADD THIS IMPORT
 from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.orm import joinedload, load_only
 
 
 class UserRole(enum.Enum):
@@ -252,7 +253,8 @@ class MenuItem(db.Model):
     name = db.Column(db.String(150), nullable=False)
     description = db.Column(db.Text)
     price = db.Column(db.Numeric(10, 2), nullable=False)
-    image_url = db.Column(db.String(500))
+    image_url = db.Column(db.String(500), index=True)  # indexed for the upload GC scan and variant lookups
+    image_variants = db.Column(JSON)  # {"thumbnail": url, "medium": url, "large": url}, see image_processing
     category = db.Column(db.String(100))
     dietary_tags = db.Column(JSON)
     preparation_time = db.Column(db.Integer)
@@ -261,28 +263,136 @@ class MenuItem(db.Model):
     is_recommended = db.Column(db.Boolean, default=False)
     caterer_id = db.Column(db.Integer, db.ForeignKey("caterer_profiles.id"))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default="1")  # bumped on every update
 
     caterer = db.relationship("CatererProfile", back_populates="menu_items")
 
-    def to_dict(self):
+    __table_args__ = (
+        # Keyset pagination of the public catalogue: newest active items first
+        db.Index("ix_menu_items_active_created_id", "is_active", "created_at", "id"),
+    )
+
+    # Serialized field -> (columns it reads, serializer), in output order
+    SERIALIZED_FIELDS = {
+        "id": (["id"], lambda item: item.id),
+        "name": (["name"], lambda item: item.name),
+        "description": (["description"], lambda item: item.description),
+        "price": (["price"], lambda item: float(item.price) if item.price else 0),
+        "image_url": (["image_url"], lambda item: item.image_url),
+        "image_variants": (["image_variants"], lambda item: item.image_variants or {}),
+        "thumbnail_url": (
+            ["image_url", "image_variants"],
+            lambda item: (item.image_variants or {}).get("thumbnail") or item.image_url
+        ),
+        "category": (["category"], lambda item: item.category),
+        "dietary_tags": (["dietary_tags"], lambda item: item.dietary_tags or []),
+        "preparation_time": (["preparation_time"], lambda item: item.preparation_time),
+        "is_active": (["is_active"], lambda item: item.is_active),
+        "is_trending": (["is_trending"], lambda item: item.is_trending),
+        "is_recommended": (["is_recommended"], lambda item: item.is_recommended),
+        "caterer_id": (["caterer_id"], lambda item: item.caterer_id),
+        "caterer_business_name": (
+            ["caterer_id"], lambda item: item.caterer.business_name if item.caterer else None
+        ),
+        "created_at": (["created_at"], lambda item: item.created_at.isoformat() if item.created_at else None),
+        "version": (["version"], lambda item: item.version),
+    }
+
+    @classmethod
+    def serializable_query(cls, fields=None):
+        """
+        Base query for anything passed to to_dict: the caterer is joined into
+        the same SELECT so serializing a list doesn't issue a query per item.
+        With a sparse fieldset only the columns those fields read are loaded.
+        """
+        query = cls.query
+
+        if fields is not None:
+            # id and created_at always load, they back keyset pagination
+            columns = {"id", "created_at"}
+            for field in fields:
+                columns.update(cls.SERIALIZED_FIELDS[field][0])
+            query = query.options(load_only(*[getattr(cls, column) for column in columns]))
+
+        if fields is None or "caterer_business_name" in fields:
+            query = query.options(
+                joinedload(cls.caterer).load_only(CatererProfile.id, CatererProfile.business_name)
+            )
+        return query
+
+    def to_dict(self, fields=None):
+        """Serialize the item, or only `fields` for a sparse fieldset"""
         return {
-            "id": self.id,
-            "name": self.name,
-            "description": self.description,
-            "price": float(self.price) if self.price else 0,
-            "image_url": self.image_url,
-            "category": self.category,
-            "dietary_tags": self.dietary_tags or [],
-            "preparation_time": self.preparation_time,
-            "is_active": self.is_active,
-            "is_trending": self.is_trending,
-            "is_recommended": self.is_recommended,
-            "caterer_id": self.caterer_id,
-            "caterer_business_name": self.caterer.business_name if self.caterer else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None
+            field: serialize(self)
+            for field, (_, serialize) in self.SERIALIZED_FIELDS.items()
+            if fields is None or field in fields
         }
 
 
+# Normalized copy of MenuItem.dietary_tags so tag filters can use an index
+class MenuItemDietaryTag(db.Model):
+    __tablename__ = "menu_item_dietary_tags"
+    menu_item_id = db.Column(db.Integer, db.ForeignKey("menu_items.id", ondelete="CASCADE"), primary_key=True)
+    tag = db.Column(db.String(50), primary_key=True)
+
+    __table_args__ = (
+        db.Index("ix_menu_item_dietary_tags_tag", "tag", "menu_item_id"),
+    )
+
+
+# Quantities of each menu item in confirmed orders, bucketed by confirmation day
+class MenuItemDailyOrders(db.Model):
+    __tablename__ = "menu_item_daily_orders"
+    menu_item_id = db.Column(db.Integer, db.ForeignKey("menu_items.id", ondelete="CASCADE"), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    quantity = db.Column(db.Integer, nullable=False, default=0)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Window scans read a day range for all items
+        db.Index("ix_menu_item_daily_orders_day", "day", "menu_item_id"),
+    )
+
+
+# Precomputed trending/recommended lists, rebuilt from MenuItemDailyOrders
+class MenuItemRanking(db.Model):
+    __tablename__ = "menu_item_rankings"
+    kind = db.Column(db.String(20), primary_key=True)  # "trending" or "recommended"
+    rank = db.Column(db.Integer, primary_key=True)  # 1 is the most popular
+    menu_item_id = db.Column(db.Integer, db.ForeignKey("menu_items.id", ondelete="CASCADE"), nullable=False)
+    score = db.Column(db.Integer, nullable=False)
+    computed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+# How many completed orders contained both items, stored in both directions
+class MenuItemPairCount(db.Model):
+    __tablename__ = "menu_item_pair_counts"
+    menu_item_id = db.Column(db.Integer, db.ForeignKey("menu_items.id", ondelete="CASCADE"), primary_key=True)
+    other_item_id = db.Column(db.Integer, db.ForeignKey("menu_items.id", ondelete="CASCADE"), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+# Top-K "frequently ordered together" items per menu item, from MenuItemPairCount
+class MenuItemNeighbour(db.Model):
+    __tablename__ = "menu_item_neighbours"
+    menu_item_id = db.Column(db.Integer, db.ForeignKey("menu_items.id", ondelete="CASCADE"), primary_key=True)
+    rank = db.Column(db.Integer, primary_key=True)
+    neighbour_id = db.Column(db.Integer, db.ForeignKey("menu_items.id", ondelete="CASCADE"), nullable=False)
+    score = db.Column(db.Integer, nullable=False)
+
+
+# Order counts and revenue per caterer, order day (created_at) and status, for the stats endpoint
+class CatererDailyStats(db.Model):
+    __tablename__ = "caterer_daily_stats"
+    caterer_id = db.Column(db.Integer, db.ForeignKey("caterer_profiles.id", ondelete="CASCADE"), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)  # OrderStatus value
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Numeric(12, 2), nullable=False, default=0)  # final_total, else total_amount
+    guest_count = db.Column(db.Integer, nullable=False, default=0)  # summed over orders that have one
+    guest_order_count = db.Column(db.Integer, nullable=False, default=0)
+
+
 # ENHANCED OrderStatus with catering-specific statuses
 class OrderStatus(enum.Enum):
     DRAFT = "draft"
@@ -311,12 +421,20 @@ class Order(db.Model):
     delivery_instructions = db.Column(db.Text)  # ADDED
     guest_count = db.Column(db.Integer)  # ADDED - for catering orders
     special_requirements = db.Column(JSON)  # ADDED - ["vegetarian", "nut-free", "gluten-free"]
+    event_type = db.Column(db.String(50))  # wedding, birthday, corporate, etc.
+
+    # Contact details given with the order (delivery goes in delivery_address)
+    contact_name = db.Column(db.String(150))
+    contact_email = db.Column(db.String(120), index=True)
+    contact_phone = db.Column(db.String(30))
+    dietary_requirements = db.Column(JSON)  # ["vegetarian", "gluten-free"]
 
     # Financial fields
     total_amount = db.Column(db.Numeric(10, 2), nullable=False)
     estimated_total = db.Column(db.Numeric(10, 2))  # ADDED - for catering quotes
     final_total = db.Column(db.Numeric(10, 2))  # ADDED - actual final amount
     deposit_paid = db.Column(db.Numeric(10, 2), default=0)  # ADDED
+    item_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")  # sum of item quantities
 
     # Status & timestamps
     status = db.Column(db.Enum(OrderStatus), default=OrderStatus.PENDING)
@@ -328,7 +446,22 @@ class Order(db.Model):
 
     client = db.relationship("User", back_populates="orders")
     caterer = db.relationship("CatererProfile", backref=db.backref("orders", lazy="dynamic"))
-    order_items = db.relationship("OrderItem", back_populates="order", cascade="all, delete-orphan", lazy="dynamic")
+    # Plain list so it can be eager loaded (selectinload) where the items are needed
+    order_items = db.relationship("OrderItem", back_populates="order", cascade="all, delete-orphan", lazy="select")
+
+    __table_args__ = (
+        # Order lists: a user's orders newest first, optionally filtered by status
+        db.Index("ix_orders_client_created", "client_id", "created_at", "id"),
+        db.Index("ix_orders_client_status_created", "client_id", "status", "created_at", "id"),
+        db.Index("ix_orders_caterer_created", "caterer_id", "created_at", "id"),
+        db.Index("ix_orders_caterer_status_created", "caterer_id", "status", "created_at", "id"),
+        # Admin order list (all orders), optionally filtered by status
+        db.Index("ix_orders_created_id", "created_at", "id"),
+        db.Index("ix_orders_status_created_id", "status", "created_at", "id"),
+        # Cart lookups (client_id, status=DRAFT) for carts not yet moved to the cart store
+        db.Index("ix_orders_draft_cart", "client_id",
+                 postgresql_where=db.text("status = 'DRAFT'"), sqlite_where=db.text("status = 'DRAFT'")),
+    )
 
     def is_catering_order(self):
         """Check if this is a catering order (has event details)"""
@@ -336,8 +469,8 @@ class Order(db.Model):
 
     # In your Order class, add this method:
     def get_cart_count(self):
-        """Get total quantity of items in order (for cart)"""
-        return sum(item.quantity for item in self.order_items) if self.order_items else 0
+        """Get total quantity of items in order (for cart), kept in item_count"""
+        return self.item_count or 0
 
 
 # ENHANCED OrderItem model with catering features
@@ -355,6 +488,13 @@ class OrderItem(db.Model):
     order = db.relationship("Order", back_populates="order_items")
     menu_item = db.relationship("MenuItem", backref=db.backref("order_items", lazy="dynamic"))  # ADD THIS LINE
 
+    __table_args__ = (
+        # Items of an order, and the cart's line for a given menu item
+        db.Index("ix_order_items_order_menu_item", "order_id", "menu_item_id"),
+        # Order lines of a menu item (foreign key checks when a menu item is deleted)
+        db.Index("ix_order_items_menu_item", "menu_item_id"),
+    )
+
     def total_price(self):
         """Calculate total price for this order item"""
         return float(self.unit_price * self.quantity) if self.unit_price else 0
@@ -1,11 +1,27 @@
 # app/routes/menu_routes.py
+import csv
+import io
 import json
-import os
+from functools import partial
 from flask import Blueprint, request, jsonify
-from app.extensions import db
-from app.models import MenuItem, User
+from sqlalchemy import insert, update
+from app.extensions import db, cache
+from app.models import MenuItem, MenuItemRanking, User
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.utils.file_upload import save_menu_item_image
+from app.utils.image_processing import schedule_image_variants
+from app.utils.cache import bump_catalogue_version
+from app.utils.http_cache import make_etag, not_modified, with_etag
+from app.utils.pagination import paginate_keyset, parse_limit, InvalidCursor
+from app.utils.fieldsets import parse_fields, InvalidFields
+from app.utils.search import apply_search, index_menu_items
+from app.utils.rankings import ranked_kinds, ranked_item_ids
+from app.utils.dietary_tags import (
+    normalize_dietary_tags, sync_dietary_tags, parse_dietary_tag_args, filter_by_dietary_tags
+)
+from app.utils.menu_validation import (
+    validate_menu_item_data, parse_bool, parse_price, parse_preparation_time
+)
 
 menu_bp = Blueprint("menu", __name__)
 
@@ -31,9 +47,10 @@ def create_menu_item():
 
     try:
         image_url = None
+        is_upload = bool(request.content_type and 'multipart/form-data' in request.content_type)
 
         # Check if this is a file upload (form-data) or JSON request
-        if request.content_type and 'multipart/form-data' in request.content_type:
+        if is_upload:
             # ===== FILE UPLOAD MODE =====
             print("Processing as form-data with file upload")
 
@@ -74,29 +91,29 @@ def create_menu_item():
         else:
             # ===== PURE JSON MODE =====
             print("Processing as JSON request")
-            data = request.get_json() or {}
-            image_url = data.get('image_url')  # Use external URL from JSON
+            data = request.get_json() or {}  # image_url in the JSON is an external URL
 
-        # Validate required fields
-        if not data.get('name') or not data.get('price'):
-            return jsonify({"msg": "Name and price are required"}), 400
+        # Validate with the rules shared by every menu item write path
+        values, error = validate_menu_item_data(data)
+        if error:
+            return jsonify({"msg": error}), 400
+
+        if is_upload:
+            values['image_url'] = image_url
 
         # Create menu item
-        menu_item = MenuItem(
-            name=data.get('name'),
-            description=data.get('description', ''),
-            price=float(data.get('price')),
-            image_url=image_url,
-            category=data.get('category'),
-            dietary_tags=data.get('dietary_tags', []),
-            preparation_time=int(data.get('preparation_time')) if data.get('preparation_time') else None,
-            is_trending=data.get('is_trending', 'false').lower() == 'true',
-            is_recommended=data.get('is_recommended', 'false').lower() == 'true',
-            caterer_id=user.caterer_profile.id
-        )
+        menu_item = MenuItem(**values, caterer_id=user.caterer_profile.id)
 
         db.session.add(menu_item)
+        db.session.flush()
+        sync_dietary_tags({menu_item.id: menu_item.dietary_tags})
+        index_menu_items([menu_item.id])
         db.session.commit()
+        bump_catalogue_version()
+
+        # Thumbnails are generated in the background and recorded when ready
+        if is_upload and menu_item.image_url:
+            schedule_image_variants(menu_item.image_url)
 
         return jsonify({
             "msg": "Menu item created successfully",
@@ -109,11 +126,127 @@ def create_menu_item():
         return jsonify({"msg": "Failed to create menu item", "error": str(e)}), 500
 
 
+# ===== BULK IMPORT - STREAMS CSV OR NDJSON =====
+IMPORT_FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+IMPORT_CHUNK_SIZE = 500
+MAX_REPORTED_IMPORT_ERRORS = 1000
+
+
+def _iter_import_rows(stream, import_format):
+    """Yield (row_number, data, error) for each record of a CSV / NDJSON text stream"""
+    if import_format == "csv":
+        for row_number, row in enumerate(csv.DictReader(stream), start=1):
+            yield row_number, row, None
+        return
+
+    for row_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield row_number, json.loads(line), None
+        except ValueError:
+            yield row_number, None, "Invalid JSON"
+
+
+def _insert_import_chunk(chunk):
+    """executemany INSERT of validated rows, then index their tags and search documents"""
+    item_ids = db.session.scalars(
+        insert(MenuItem).returning(MenuItem.id, sort_by_parameter_order=True),
+        chunk
+    ).all()
+    sync_dietary_tags({item_id: values["dietary_tags"] for item_id, values in zip(item_ids, chunk)})
+    index_menu_items(item_ids)
+    return len(item_ids)
+
+
+@menu_bp.route("/items/import", methods=["POST"])
+@jwt_required()
+def import_menu_items():
+    """
+    Bulk import menu items for the authenticated caterer.
+    The body is streamed row by row, either:
+    1. CSV (Content-Type: text/csv) with a header row: name,price,description,category,...
+    2. NDJSON (Content-Type: application/x-ndjson), one menu item object per line
+    ?format=csv|ndjson overrides the Content-Type.
+
+    Rows are validated like POST /items. Valid rows are inserted in chunks
+    inside a single transaction, invalid rows are reported by row number.
+    """
+    identity = get_jwt_identity()
+    user_id = int(identity)
+
+    user = User.query.get(user_id)
+    if not user or user.role.value != "caterer" or not user.caterer_profile:
+        return jsonify({"msg": "Caterer access required"}), 403
+
+    import_format = request.args.get("format") or IMPORT_FORMATS.get(request.mimetype)
+    if import_format not in ("csv", "ndjson"):
+        return jsonify({"msg": "Send text/csv or application/x-ndjson"}), 415
+
+    caterer_id = user.caterer_profile.id
+    stream = io.TextIOWrapper(io.BufferedReader(request.stream), encoding="utf-8-sig", newline="")
+
+    imported = 0
+    failed = 0
+    errors = []
+    chunk = []
+
+    try:
+        for row_number, data, error in _iter_import_rows(stream, import_format):
+            if not error:
+                values, error = validate_menu_item_data(data)
+
+            if error:
+                failed += 1
+                if len(errors) < MAX_REPORTED_IMPORT_ERRORS:
+                    errors.append({"row": row_number, "error": error})
+                continue
+
+            values["caterer_id"] = caterer_id
+            chunk.append(values)
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                imported += _insert_import_chunk(chunk)
+                chunk = []
+
+        if chunk:
+            imported += _insert_import_chunk(chunk)
+
+        db.session.commit()
+
+    except (UnicodeDecodeError, csv.Error) as e:
+        db.session.rollback()
+        return jsonify({"msg": "Could not read import file", "error": str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error: {str(e)}")
+        return jsonify({"msg": "Failed to import menu items", "error": str(e)}), 500
+
+    if imported:
+        bump_catalogue_version()
+
+    return jsonify({
+        "msg": f"Imported {imported} menu items",
+        "imported": imported,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors)
+    }), 201 if imported else 400
+
+
 @menu_bp.route("/items", methods=["GET"])
 @jwt_required()
 def get_my_menu_items():
     """
     Get all menu items for the authenticated caterer
+    Query params:
+    - fields: comma separated sparse fieldset, e.g. fields=id,name,price,image_url
     """
     identity = get_jwt_identity()
     user_id = int(identity)
@@ -122,12 +255,29 @@ def get_my_menu_items():
     if not user or user.role.value != "caterer" or not user.caterer_profile:
         return jsonify({"msg": "Caterer access required"}), 403
 
-    menu_items = MenuItem.query.filter_by(caterer_id=user.caterer_profile.id).all()
-
-    return jsonify({
-        "menu_items": [item.to_dict() for item in menu_items],
+    try:
+        fields = parse_fields(request.args.get("fields"), MenuItem.SERIALIZED_FIELDS)
+    except InvalidFields as e:
+        return jsonify({"msg": str(e)}), 400
+
+    # Fingerprint of the caterer's rows: inserts and deletes change the count/max id,
+    # every update bumps a row version. Read from the database so all workers agree
+    caterer_id = user.caterer_profile.id
+    fingerprint = db.session.query(
+        db.func.count(MenuItem.id), db.func.max(MenuItem.id),
+        db.func.sum(MenuItem.version), db.func.max(MenuItem.created_at)
+    ).filter(MenuItem.caterer_id == caterer_id).one()
+    etag = make_etag("my-menu-items", caterer_id, *fingerprint, fields)
+    response = not_modified(etag)
+    if response is not None:
+        return response
+
+    menu_items = MenuItem.serializable_query(fields).filter_by(caterer_id=caterer_id).all()
+
+    return with_etag(jsonify({
+        "menu_items": [item.to_dict(fields) for item in menu_items],
         "total": len(menu_items)
-    }), 200
+    }), etag)
 
 
 # ===== ADD THIS MISSING ENDPOINT =====
@@ -144,7 +294,7 @@ def get_menu_item(item_id):
     if not user or user.role.value != "caterer" or not user.caterer_profile:
         return jsonify({"msg": "Caterer access required"}), 403
 
-    menu_item = MenuItem.query.filter_by(
+    menu_item = MenuItem.serializable_query().filter_by(
         id=item_id,
         caterer_id=user.caterer_profile.id
     ).first()
@@ -178,6 +328,9 @@ def update_menu_item(item_id):
 
     data = request.get_json() or {}
 
+    if "dietary_tags" in data:
+        data["dietary_tags"] = normalize_dietary_tags(data["dietary_tags"])
+
     # Update fields
     updatable_fields = [
         "name", "description", "price", "image_url", "category",
@@ -185,11 +338,32 @@ def update_menu_item(item_id):
         "is_trending", "is_recommended"
     ]
 
+    previous_image_url = menu_item.image_url
+    image_changed = "image_url" in data and data["image_url"] != previous_image_url
+
     for field in updatable_fields:
         if field in data:
             setattr(menu_item, field, data[field])
 
+    # Variants belong to the old image, new ones are generated after commit
+    if image_changed:
+        menu_item.image_variants = None
+
+    if "dietary_tags" in data:
+        sync_dietary_tags({menu_item.id: menu_item.dietary_tags})
+
+    # Keep the search document in sync with the searchable columns
+    if "name" in data or "description" in data:
+        db.session.flush()
+        index_menu_items([menu_item.id])
+
+    menu_item.version = MenuItem.version + 1
     db.session.commit()
+    bump_catalogue_version()
+
+    # The previous image file is left to `flask uploads gc`, another item may be reusing it
+    if image_changed:
+        schedule_image_variants(menu_item.image_url)
 
     return jsonify({
         "msg": "Menu item updated successfully",
@@ -197,6 +371,140 @@ def update_menu_item(item_id):
     }), 200
 
 
+# ===== BATCH UPDATE - ONE SET-BASED UPDATE PER FIELD GROUP =====
+def _parse_category(value):
+    if value in (None, ''):
+        return None
+    if not isinstance(value, str) or len(value) > 100:
+        raise ValueError("category must be a string of at most 100 characters")
+    return value
+
+
+BATCH_UPDATABLE_FIELDS = {
+    "price": parse_price,
+    "is_active": partial(parse_bool, field="is_active"),
+    "is_trending": partial(parse_bool, field="is_trending"),
+    "is_recommended": partial(parse_bool, field="is_recommended"),
+    "category": _parse_category,
+    "preparation_time": parse_preparation_time,
+}
+MAX_BATCH_UPDATE_ITEMS = 5000
+
+
+@menu_bp.route("/items/batch", methods=["PATCH"])
+@jwt_required()
+def batch_update_menu_items():
+    """
+    Apply partial updates to many of the caterer's menu items at once
+    Accepts either per-item updates:
+    {
+        "updates": [
+            {"id": 1, "price": "12.50"},
+            {"id": 2, "is_active": false}
+        ]
+    }
+    or the same change for a list of ids:
+    { "ids": [1, 2, 3], "set": {"is_active": false} }
+
+    Updatable fields: price, is_active, is_trending, is_recommended, category, preparation_time
+    Items are grouped by the set of fields they change and each group is a
+    single UPDATE, restricted to the caterer's items in the WHERE clause.
+    Returns the ids and new versions of the updated items.
+    """
+    identity = get_jwt_identity()
+    user_id = int(identity)
+
+    user = User.query.get(user_id)
+    if not user or user.role.value != "caterer" or not user.caterer_profile:
+        return jsonify({"msg": "Caterer access required"}), 403
+
+    data = request.get_json() or {}
+    updates = data.get("updates")
+    if updates is None and "ids" in data:
+        if not isinstance(data["ids"], list) or not isinstance(data.get("set"), dict):
+            return jsonify({"msg": "ids must be a list and set an object"}), 400
+        updates = [{**data["set"], "id": item_id} for item_id in data["ids"]]
+
+    if not isinstance(updates, list) or not updates:
+        return jsonify({"msg": "updates must be a non-empty list"}), 400
+    if len(updates) > MAX_BATCH_UPDATE_ITEMS:
+        return jsonify({"msg": f"At most {MAX_BATCH_UPDATE_ITEMS} items per batch"}), 400
+
+    # Validate everything up front, the batch is applied all or nothing
+    changes = {}
+    errors = []
+    for index, item in enumerate(updates):
+        if not isinstance(item, dict) or isinstance(item.get("id"), bool) or not isinstance(item.get("id"), int):
+            errors.append({"index": index, "error": "Each update needs an integer id"})
+            continue
+
+        fields = {field: value for field, value in item.items() if field != "id"}
+        unknown = [field for field in fields if field not in BATCH_UPDATABLE_FIELDS]
+        if unknown or not fields:
+            errors.append({"index": index, "id": item["id"],
+                           "error": f"Unknown fields: {', '.join(unknown)}" if unknown else "Nothing to update"})
+            continue
+
+        try:
+            parsed = {field: BATCH_UPDATABLE_FIELDS[field](value) for field, value in fields.items()}
+        except ValueError as e:
+            errors.append({"index": index, "id": item["id"], "error": str(e)})
+            continue
+
+        # Several updates for the same id are merged, later values win
+        changes.setdefault(item["id"], {}).update(parsed)
+
+    if errors:
+        return jsonify({"msg": "Invalid batch update", "errors": errors}), 400
+
+    groups = {}
+    for item_id, values in changes.items():
+        groups.setdefault(frozenset(values), {})[item_id] = values
+
+    caterer_id = user.caterer_profile.id
+    updated = []
+
+    try:
+        for fields, items in groups.items():
+            assignments = {}
+            for field in fields:
+                column = MenuItem.__table__.c[field]
+                distinct_values = {values[field] for values in items.values()}
+                if len(distinct_values) == 1:
+                    assignments[field] = distinct_values.pop()
+                else:
+                    assignments[field] = db.cast(
+                        db.case({item_id: values[field] for item_id, values in items.items()}, value=MenuItem.id),
+                        column.type
+                    )
+
+            result = db.session.execute(
+                update(MenuItem)
+                .where(MenuItem.id.in_(list(items)), MenuItem.caterer_id == caterer_id)
+                .values(**assignments, version=MenuItem.version + 1)
+                .returning(MenuItem.id, MenuItem.version),
+                execution_options={"synchronize_session": False}
+            )
+            updated.extend({"id": row.id, "version": row.version} for row in result)
+
+        db.session.commit()
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error: {str(e)}")
+        return jsonify({"msg": "Failed to update menu items", "error": str(e)}), 500
+
+    if updated:
+        bump_catalogue_version()
+
+    updated_ids = {row["id"] for row in updated}
+    return jsonify({
+        "msg": f"Updated {len(updated)} menu items",
+        "updated": sorted(updated, key=lambda row: row["id"]),
+        "not_found": sorted(item_id for item_id in changes if item_id not in updated_ids)
+    }), 200
+
+
 # @menu_bp.route("/items/<int:item_id>", methods=["DELETE"])
 # @jwt_required()
 # def delete_menu_item(item_id):
@@ -248,73 +556,142 @@ def hard_delete_menu_item(item_id):
     if not menu_item:
         return jsonify({"msg": "Menu item not found"}), 404
 
-    # Delete associated image file if exists
-    if menu_item.image_url and not menu_item.image_url.startswith('http'):
-        try:
-            image_path = menu_item.image_url.replace('/static/', 'app/static/')
-            if os.path.exists(image_path):
-                os.remove(image_path)
-        except Exception as e:
-            print(f"Error deleting image file: {e}")
-
     # Permanent delete from database
+    sync_dietary_tags({item_id: []})
     db.session.delete(menu_item)
+    db.session.flush()
+    index_menu_items([item_id])
     db.session.commit()
+    bump_catalogue_version()
 
+    # Images are shared between items and an upload may be reusing this one right now,
+    # so the file stays until `flask uploads gc` finds it unreferenced past the grace period
     return jsonify({"msg": "Menu item permanently deleted"}), 200
 
 
 # ===== CLIENT/PUBLIC ENDPOINTS =====
 
+# Sections of the public menu, trending/recommended items may appear in both
+PUBLIC_MENU_SECTIONS = ("trending", "recommended", "all_items")
+
+# Hand-set flags, used for a section until its ranking from order data exists
+PUBLIC_MENU_SECTION_FLAGS = {
+    "trending": MenuItem.is_trending.is_(True),
+    "recommended": MenuItem.is_recommended.is_(True),
+}
+
+
+def _section_membership(section, rankings):
+    """Filter for the items of a ranked section, from its ranking or its flag"""
+    if section in rankings:
+        return MenuItem.id.in_(ranked_item_ids(section))
+    return PUBLIC_MENU_SECTION_FLAGS[section]
+
 @menu_bp.route("/public/items", methods=["GET"])
+@cache.cached()
 def get_public_menu_items():
     """
-    Get all active menu items for clients (public endpoint)
+    Get active menu items for clients (public endpoint), one page per section
     Query params:
     - category: filter by category
     - dietary_tag: filter by dietary tag (gluten-free, vegan, etc.)
-    - search: search in name/description
+      repeat the param or comma separate for several tags
+    - dietary_match: "all" (default) or "any" when several tags are given
+    - search: full-text search in name/description/caterer business name
+      (prefix matched, results ranked by relevance)
+    - section: only return one of trending / recommended / all_items
+      trending/recommended come ranked from recent orders, or from the
+      is_trending/is_recommended flags until there is order data
+    - limit: page size for every section (default 20, max 100)
+    - <section>_limit: page size for one section, e.g. trending_limit=8
+    - <section>_cursor: continuation token from next_cursors of the previous page
+    - fields: comma separated sparse fieldset, e.g. fields=id,name,price,image_url
     """
     try:
+        fields = parse_fields(request.args.get("fields"), MenuItem.SERIALIZED_FIELDS)
+
         # Base query for active items
-        query = MenuItem.query.filter_by(is_active=True)
+        query = MenuItem.serializable_query(fields).filter_by(is_active=True)
 
         # Apply filters
         category = request.args.get("category")
         if category:
             query = query.filter_by(category=category)
 
-        dietary_tag = request.args.get("dietary_tag")
-        if dietary_tag:
-            # Method 2: cast to text and search
-            query = query.filter(db.cast(MenuItem.dietary_tags, db.Text).ilike(f'%"{dietary_tag}"%'))
+        dietary_tags = parse_dietary_tag_args(request.args)
+        if dietary_tags:
+            query = filter_by_dietary_tags(query, dietary_tags, request.args.get("dietary_match", "all"))
 
+        # Newest first, or by relevance when searching
+        sort_columns = [(MenuItem.created_at, True), (MenuItem.id, True)]
+        sort_key = lambda row: (row.created_at, row.id)
+        ranked = False
         search = request.args.get("search")
         if search:
-            query = query.filter(
-                (MenuItem.name.ilike(f"%{search}%")) |
-                (MenuItem.description.ilike(f"%{search}%"))
+            query, rank = apply_search(query, search)
+            if rank is not None:
+                ranked = True
+                query = query.add_columns(rank.label("search_rank"))
+                sort_columns = [(rank, True), (MenuItem.id, True)]
+                sort_key = lambda row: (row.search_rank, row.MenuItem.id)
+
+        requested_section = request.args.get("section")
+        if requested_section and requested_section not in PUBLIC_MENU_SECTIONS:
+            return jsonify({"msg": f"Unknown section: {requested_section}"}), 400
+
+        default_limit = parse_limit(request.args.get("limit"))
+        response = {"next_cursors": {}}
+        total = 0
+        rankings = ranked_kinds()
+
+        # Organize by sections for frontend, each one is its own indexed page query
+        for section in PUBLIC_MENU_SECTIONS:
+            if requested_section and section != requested_section:
+                continue
+
+            section_query, section_columns, section_key, has_rank = query, sort_columns, sort_key, ranked
+            if section == "all_items":
+                section_query = section_query.filter(db.not_(db.or_(
+                    *[_section_membership(name, rankings) for name in PUBLIC_MENU_SECTION_FLAGS]
+                )))
+            elif section in rankings and not ranked:
+                # Read the precomputed list in rank order
+                section_query = section_query.join(
+                    MenuItemRanking,
+                    db.and_(MenuItemRanking.menu_item_id == MenuItem.id, MenuItemRanking.kind == section)
+                ).add_columns(MenuItemRanking.rank.label("popularity_rank"))
+                section_columns = [(MenuItemRanking.rank, False)]
+                section_key = lambda row: (row.popularity_rank,)
+                has_rank = True
+            else:
+                section_query = section_query.filter(_section_membership(section, rankings))
+
+            rows, next_cursor = paginate_keyset(
+                section_query,
+                section_columns,
+                section_key,
+                parse_limit(request.args.get(f"{section}_limit"), default=default_limit),
+                request.args.get(f"{section}_cursor")
             )
+            items = [row.MenuItem if has_rank else row for row in rows]
 
-        menu_items = query.all()
+            response[section] = [item.to_dict(fields) for item in items]
+            response["next_cursors"][section] = next_cursor
+            total += len(items)
 
-        # Organize by sections for frontend
-        trending_items = [item for item in menu_items if item.is_trending]
-        recommended_items = [item for item in menu_items if item.is_recommended]
-        other_items = [item for item in menu_items if not item.is_trending and not item.is_recommended]
-
-        return jsonify({
-            "trending": [item.to_dict() for item in trending_items],
-            "recommended": [item.to_dict() for item in recommended_items],
-            "all_items": [item.to_dict() for item in other_items],
-            "total": len(menu_items)
-        }), 200
+        response["total"] = total
+        return jsonify(response), 200
 
+    except InvalidCursor:
+        return jsonify({"msg": "Invalid cursor"}), 400
+    except InvalidFields as e:
+        return jsonify({"msg": str(e)}), 400
     except Exception as e:
         return jsonify({"msg": "Error fetching menu items", "error": str(e)}), 500
 
 
 @menu_bp.route("/public/categories", methods=["GET"])
+@cache.cached()
 def get_categories():
     """
     Get all available menu categories
@@ -330,7 +707,7 @@ def get_public_menu_item(item_id):
     """
     Get a specific menu item details (public)
     """
-    menu_item = MenuItem.query.filter_by(id=item_id, is_active=True).first()
+    menu_item = MenuItem.serializable_query().filter_by(id=item_id, is_active=True).first()
 
     if not menu_item:
         return jsonify({"msg": "Menu item not found"}), 404
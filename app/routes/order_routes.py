@@ -1,13 +1,30 @@
 # routes/order_routes.py
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, insert
 # Add these imports at the top if not already present
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, load_only, selectinload
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
+from decimal import Decimal
 
 from app.models import db, User, Order, OrderItem, MenuItem, CatererProfile, CustomerProfile, OrderStatus, UserRole
+from app.extensions import cache, carts
+from app.utils.cart_store import CartItemNotFound, add_cart_item, set_cart_item_quantity
+from app.utils.http_cache import make_etag, not_modified, with_etag
+from app.utils.fieldsets import parse_fields, InvalidFields
+from app.utils.rankings import COUNTED_ORDER_STATUSES, record_order_status_change, refresh_menu_rankings_if_stale
+from app.utils.recommendations import (
+    SUGGESTIONS_VERSION, bump_suggestions_version, record_order_completion, suggest_menu_items
+)
+from app.utils.order_stats import (
+    STATS_PERIODS, caterer_order_stats, order_stats_contribution, record_order_stats_change
+)
+from app.utils.menu_validation import parse_price
+from app.utils.pagination import InvalidCursor, estimated_count, paginate_keyset, parse_limit
+from app.utils.pricing import (
+    PricingError, get_price_table, parse_quantity, price_order_items
+)
 
 order_bp = Blueprint('order', __name__)
 
@@ -20,76 +37,233 @@ def generate_catering_order_number():
     return f"CAT-{uuid.uuid4().hex[:8].upper()}"
 
 
+# Menu item fields returned with cart suggestions
+SUGGESTION_FIELDS = ['id', 'name', 'price', 'thumbnail_url', 'caterer_id']
+
+# Columns Order.is_catering_order() reads
+CATERING_COLUMNS = [Order.event_name, Order.event_date, Order.guest_count]
+
+
+def is_catering_row(row):
+    """Order.is_catering_order() for a projected row"""
+    return bool(row.event_name and row.event_date and row.guest_count)
+
+
+# Order list field -> (columns it selects, serializer of the projected row), for sparse fieldsets (?fields=)
+ORDER_SUMMARY_FIELDS = {
+    'id': ([Order.id], lambda row: row.id),
+    'order_number': ([Order.order_number], lambda row: row.order_number),
+    'status': ([Order.status], lambda row: row.status.value),
+    'total_amount': ([Order.total_amount], lambda row: float(row.total_amount)),
+    'estimated_total': (
+        [Order.estimated_total], lambda row: float(row.estimated_total) if row.estimated_total else None
+    ),
+    'created_at': ([Order.created_at], lambda row: row.created_at.isoformat()),
+    'is_catering': (CATERING_COLUMNS, is_catering_row),
+    'caterer_business_name': (
+        [CatererProfile.business_name.label('caterer_business_name')], lambda row: row.caterer_business_name
+    ),
+    'client_email': ([User.email.label('client_email')], lambda row: row.client_email),
+}
+
+# Only present on catering orders
+CATERING_SUMMARY_FIELDS = {
+    'event_name': ([Order.event_name], lambda row: row.event_name),
+    'event_date': ([Order.event_date], lambda row: row.event_date.isoformat() if row.event_date else None),
+    'event_time': ([Order.event_time], lambda row: row.event_time.strftime('%H:%M') if row.event_time else None),
+    'guest_count': ([Order.guest_count], lambda row: row.guest_count),
+}
+
+
+def order_summary_query(fields=None):
+    """
+    One projection query for the order list: only the Order columns `fields`
+    needs, with the caterer's business name and the client's email joined in.
+    """
+    columns = {'id': Order.id, 'created_at': Order.created_at}  # the sort key is always selected
+    for field in fields if fields is not None else [*ORDER_SUMMARY_FIELDS, *CATERING_SUMMARY_FIELDS]:
+        if field in ORDER_SUMMARY_FIELDS:
+            selected = ORDER_SUMMARY_FIELDS[field][0]
+        else:
+            selected = CATERING_SUMMARY_FIELDS[field][0] + CATERING_COLUMNS
+        columns.update({column.key: column for column in selected})
+
+    query = db.session.query(*columns.values()).select_from(Order)
+    if 'caterer_business_name' in columns:
+        query = query.outerjoin(CatererProfile, CatererProfile.id == Order.caterer_id)
+    if 'client_email' in columns:
+        query = query.outerjoin(User, User.id == Order.client_id)
+    return query
+
+
+def serialize_order_summary(row, fields=None):
+    """Order list entry from an order_summary_query row, or only `fields` for a sparse fieldset"""
+    order_data = {
+        field: serialize(row)
+        for field, (_, serialize) in ORDER_SUMMARY_FIELDS.items()
+        if fields is None or field in fields
+    }
+
+    # Add catering-specific fields
+    catering_fields = [field for field in CATERING_SUMMARY_FIELDS if fields is None or field in fields]
+    if catering_fields and is_catering_row(row):
+        order_data.update({field: CATERING_SUMMARY_FIELDS[field][1](row) for field in catering_fields})
+
+    return order_data
+
+
+# Order column -> (payload getter, max length) for the contact/delivery details
+CONTACT_FIELDS = {
+    'contact_name': (lambda data: (data.get('client_info') or {}).get('full_name'), 150),
+    'contact_email': (lambda data: (data.get('client_info') or {}).get('email'), 120),
+    'contact_phone': (lambda data: (data.get('client_info') or {}).get('phone_number'), 30),
+    'delivery_address': (lambda data: data.get('delivery_location'), None),
+    'event_type': (lambda data: data.get('event_type'), 50),
+    'notes': (lambda data: data.get('notes'), None),
+}
+
+
+def apply_contact_details(order, data):
+    """
+    Write the contact/delivery details of a create or convert payload onto
+    the order's columns. Returns an error message for invalid input.
+    """
+    for column, (get_value, max_length) in CONTACT_FIELDS.items():
+        value = get_value(data)
+        value = str(value).strip() if value not in (None, '') else None
+        if value and max_length and len(value) > max_length:
+            return f'{column} must be at most {max_length} characters'
+        setattr(order, column, value or None)
+
+    dietary_requirements = data.get('dietary_requirements') or []
+    if not isinstance(dietary_requirements, list):
+        return 'dietary_requirements must be a list'
+    order.dietary_requirements = [str(requirement).strip() for requirement in dietary_requirements
+                                  if str(requirement).strip()]
+    return None
+
+
+# Order lists page newest first
+ORDER_LIST_SORT = [(Order.created_at, True), (Order.id, True)]
+ORDER_TOTAL_MODES = ('exact', 'estimate', 'none')
+
+
+def count_orders(filters, total_mode, cache_key):
+    """
+    Total for an order list: None for total=none, the planner's estimate for
+    total=estimate (Postgres), otherwise a COUNT cached for ORDER_COUNT_CACHE_TTL seconds.
+    Returns (total, is_estimate).
+    """
+    if total_mode == 'none':
+        return None, False
+
+    if total_mode == 'estimate':
+        estimate = estimated_count(db.session.query(Order.id).filter(*filters))
+        if estimate is not None:
+            return estimate, True
+
+    total = cache.backend.get(cache_key)
+    if total is None:
+        total = db.session.query(db.func.count(Order.id)).filter(*filters).scalar()
+        cache.backend.set(cache_key, total, current_app.config.get('ORDER_COUNT_CACHE_TTL', 60))
+    return total, False
+
+
 @order_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_orders():
-    """Get orders for the current user (client or caterer) with filtering"""
+    """
+    Get orders for the current user (client or caterer) with filtering
+    Query params: page, per_page, status, type (regular/catering), contact_email,
+    fields (comma separated sparse fieldset, e.g. fields=id,order_number,status)
+    Cursor mode (constant time on any page): pagination=cursor or cursor=<next_cursor
+    of the previous page>, limit (default 20, max 100)
+    total: exact (COUNT, cached briefly), estimate (planner estimate on Postgres)
+    or none. Defaults to none in cursor mode; page mode counts exactly unless asked otherwise.
+    """
     try:
         current_user_id = get_jwt_identity()
         user = User.query.get(current_user_id)
 
+        try:
+            fields = parse_fields(request.args.get('fields'), {**ORDER_SUMMARY_FIELDS, **CATERING_SUMMARY_FIELDS})
+        except InvalidFields as e:
+            return jsonify({'error': str(e)}), 400
+
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 10, type=int)
         status = request.args.get('status')
         order_type = request.args.get('type')  # 'regular' or 'catering'
+        contact_email = (request.args.get('contact_email') or '').strip()
+        cursor = request.args.get('cursor')
+        cursor_mode = cursor is not None or request.args.get('pagination') == 'cursor'
+
+        total_mode = request.args.get('total')
+        if total_mode is not None and total_mode not in ORDER_TOTAL_MODES:
+            return jsonify({'error': f"total must be one of {', '.join(ORDER_TOTAL_MODES)}"}), 400
 
-        # Base query
+        filters = []
         if user.role == UserRole.CLIENT:
-            query = Order.query.filter_by(client_id=current_user_id)
+            scope = f'client:{current_user_id}'
+            filters.append(Order.client_id == current_user_id)
         elif user.role == UserRole.CATERER:
-            query = Order.query.filter_by(caterer_id=user.caterer_profile.id)
-        else:  # ADMIN
-            query = Order.query
+            scope = f'caterer:{user.caterer_profile.id}'
+            filters.append(Order.caterer_id == user.caterer_profile.id)
+        else:
+            # ADMIN sees every order
+            scope = 'all'
 
         # Filter by status
         if status:
-            query = query.filter_by(status=OrderStatus(status))
+            filters.append(Order.status == OrderStatus(status))
+
+        # Filter by contact email (indexed)
+        if contact_email:
+            filters.append(Order.contact_email == contact_email)
 
         # Filter by order type
         if order_type == 'catering':
-            query = query.filter(Order.event_name.isnot(None))
+            filters.append(Order.event_name.isnot(None))
         elif order_type == 'regular':
-            query = query.filter(Order.event_name.is_(None))
+            filters.append(Order.event_name.is_(None))
 
-        orders = query.order_by(Order.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        # Base query: a single projection, no per-row loads
+        query = order_summary_query(fields).filter(*filters)
+        count_key = f"order-count:{scope}:{status or ''}:{order_type or ''}:{contact_email}"
 
-        orders_data = []
-        for order in orders.items:
-            # Get caterer business name safely
-            caterer = CatererProfile.query.get(order.caterer_id)
-
-            order_data = {
-                'id': order.id,
-                'order_number': order.order_number,
-                'status': order.status.value,
-                'total_amount': float(order.total_amount),
-                'estimated_total': float(order.estimated_total) if order.estimated_total else None,
-                'created_at': order.created_at.isoformat(),
-                'is_catering': order.is_catering_order(),
-                'caterer_business_name': caterer.business_name if caterer else None,
-                'client_email': order.client.email if order.client else None
-            }
+        if cursor_mode:
+            rows, next_cursor = paginate_keyset(
+                query, ORDER_LIST_SORT, lambda row: (row.created_at, row.id),
+                parse_limit(request.args.get('limit')), cursor or None
+            )
+            total, total_is_estimate = count_orders(filters, total_mode or 'none', count_key)
+            return jsonify({
+                'orders': [serialize_order_summary(row, fields) for row in rows],
+                'next_cursor': next_cursor,
+                'total': total,
+                'total_is_estimate': total_is_estimate
+            }), 200
 
-            # Add catering-specific fields
-            if order.is_catering_order():
-                order_data.update({
-                    'event_name': order.event_name,
-                    'event_date': order.event_date.isoformat() if order.event_date else None,
-                    'event_time': order.event_time.strftime('%H:%M') if order.event_time else None,
-                    'guest_count': order.guest_count
-                })
+        query = query.order_by(Order.created_at.desc(), Order.id.desc())
+        if total_mode is None:
+            orders = query.paginate(page=page, per_page=per_page, error_out=False)
+            total, total_is_estimate = orders.total, False
+        else:
+            orders = query.paginate(page=page, per_page=per_page, error_out=False, count=False)
+            total, total_is_estimate = count_orders(filters, total_mode, count_key)
 
-            orders_data.append(order_data)
+        orders_data = [serialize_order_summary(row, fields) for row in orders.items]
 
         return jsonify({
             'orders': orders_data,
-            'total': orders.total,
-            'pages': orders.pages,
+            'total': total,
+            'total_is_estimate': total_is_estimate,
+            'pages': -(-total // orders.per_page) if total is not None else None,
             'current_page': page
         }), 200
 
+    except InvalidCursor:
+        return jsonify({'error': 'Invalid cursor'}), 400
     except Exception as e:
         current_app.logger.error(f'Error fetching orders: {str(e)}')
         return jsonify({'error': 'Internal server error'}), 500
@@ -161,69 +335,8 @@ def create_order():
         # Determine order type
         order_type = data.get('order_type', 'regular')  # Default to regular
 
-        # Calculate total and validate menu items
-        total_amount = 0
-        order_items_data = []
-
-        for item in data['order_items']:
-            if 'menu_item_id' not in item or 'quantity' not in item:
-                return jsonify({'error': 'Each order item must have menu_item_id and quantity'}), 400
-
-            menu_item = MenuItem.query.filter_by(
-                id=item['menu_item_id'],
-                caterer_id=data['caterer_id']
-            ).first()
-
-            if not menu_item:
-                return jsonify({'error': f'Menu item not found for this caterer: {item["menu_item_id"]}'}), 404
-
-            if not menu_item.is_active:
-                return jsonify({'error': f'Menu item not available: {menu_item.name}'}), 400
-
-            quantity = item['quantity']
-            unit_price = float(menu_item.price)
-            item_total = unit_price * quantity
-
-            total_amount += item_total
-
-            order_items_data.append({
-                'menu_item': menu_item,
-                'quantity': quantity,
-                'unit_price': unit_price,
-                'customization': item.get('customization', ''),
-                'servings_per_unit': item.get('servings_per_unit', 1),
-                'special_instructions': item.get('special_instructions', '')
-            })
-
-        # Create comprehensive notes based on order type
-        if order_type == 'regular':
-            # Regular order notes format
-            client_info = data.get('client_info', {})
-            notes_parts = [
-                f"CLIENT: {client_info.get('full_name', '')}",
-                f"EMAIL: {client_info.get('email', '')}",
-                f"PHONE: {client_info.get('phone_number', '')}",
-                f"DELIVERY: {data.get('delivery_location', '')}",
-                f"DIETARY: {', '.join(data.get('dietary_requirements', []))}",
-                f"NOTES: {data.get('notes', '')}"
-            ]
-            notes = "\n".join([part for part in notes_parts if part.split(': ')[1]])
-        else:
-            # Catering order notes format
-            client_info = data.get('client_info', {})
-            notes_parts = [
-                f"EVENT: {data.get('event_name', '')}",
-                f"TYPE: {data.get('event_type', '')}",
-                f"DATE: {data.get('event_date', '')} at {data.get('event_time', '')}",
-                f"GUESTS: {data.get('guest_count', '')}",
-                f"DELIVERY: {data.get('delivery_location', '')}",
-                f"CLIENT: {client_info.get('full_name', '')}",
-                f"EMAIL: {client_info.get('email', '')}",
-                f"PHONE: {client_info.get('phone_number', '')}",
-                f"REQUIREMENTS: {', '.join(data.get('special_requirements', []))}",
-                f"NOTES: {data.get('notes', '')}"
-            ]
-            notes = "\n".join([part for part in notes_parts if part.split(': ')[1]])
+        # Validate and price all menu items with one query
+        order_lines, total_amount = price_order_items(data['caterer_id'], data['order_items'])
 
         # Create order
         order = Order(
@@ -232,36 +345,43 @@ def create_order():
             caterer_id=data['caterer_id'],
             total_amount=total_amount,
             estimated_total=total_amount,
-            status=OrderStatus.PENDING,
-            notes=notes
+            item_count=sum(line['quantity'] for line in order_lines),
+            status=OrderStatus.PENDING
         )
 
+        # Contact and delivery details go in their own columns, notes keeps the user's notes
+        error = apply_contact_details(order, data)
+        if error:
+            return jsonify({'error': error}), 400
+
         # Add catering-specific fields if this is a catering order
         if order_type == 'catering':
             order.event_name = data.get('event_name')
             order.event_date = datetime.strptime(data['event_date'], '%Y-%m-%d').date() if data.get(
                 'event_date') else None
             order.event_time = datetime.strptime(data['event_time'], '%H:%M').time() if data.get('event_time') else None
-            order.delivery_address = data.get('delivery_location', '')
             order.guest_count = data.get('guest_count')
             order.special_requirements = data.get('special_requirements', [])
 
         db.session.add(order)
         db.session.flush()
 
-        # Create order items
-        for item_data in order_items_data:
-            order_item = OrderItem(
-                order_id=order.id,
-                menu_item_id=item_data['menu_item'].id,
-                quantity=item_data['quantity'],
-                unit_price=item_data['unit_price'],
-                customization=item_data['customization'],
-                servings_per_unit=item_data['servings_per_unit'],
-                special_instructions=item_data['special_instructions']
-            )
-            db.session.add(order_item)
+        # Create order items in one bulk insert
+        if order_lines:
+            db.session.execute(insert(OrderItem), [
+                {
+                    'order_id': order.id,
+                    'menu_item_id': line['menu_item_id'],
+                    'quantity': line['quantity'],
+                    'unit_price': line['unit_price'],
+                    'customization': line['item'].get('customization', ''),
+                    'servings_per_unit': line['item'].get('servings_per_unit', 1),
+                    'special_instructions': line['item'].get('special_instructions', '')
+                }
+                for line in order_lines
+            ])
 
+        record_order_stats_change(None, order)
         db.session.commit()
 
         # Prepare response
@@ -288,6 +408,9 @@ def create_order():
 
         return jsonify(response_data), 201
 
+    except PricingError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), e.status_code
     except ValueError as e:
         db.session.rollback()
         return jsonify({'error': 'Invalid date or time format'}), 400
@@ -301,7 +424,8 @@ def create_order():
 def calculate_order_total():
     """
     Calculate order total before submission
-    Useful for showing estimated total in the UI
+    Useful for showing estimated total in the UI (called on every quantity change):
+    prices come from the cached per-caterer price table, see get_price_table.
     """
     try:
         data = request.get_json()
@@ -309,39 +433,28 @@ def calculate_order_total():
         if 'order_items' not in data or 'caterer_id' not in data:
             return jsonify({'error': 'Missing required fields: caterer_id and order_items'}), 400
 
-        total_amount = 0
-        items_breakdown = []
-
-        for item in data['order_items']:
-            if 'menu_item_id' not in item or 'quantity' not in item:
-                continue
-
-            menu_item = MenuItem.query.filter_by(
-                id=item['menu_item_id'],
-                caterer_id=data['caterer_id'],
-                is_active=True
-            ).first()
+        # Lines that can't be priced are left out of the estimate
+        order_lines, total_amount = price_order_items(
+            data['caterer_id'], data['order_items'], strict=False,
+            price_table=get_price_table(data['caterer_id'])
+        )
 
-            if menu_item:
-                quantity = item['quantity']
-                unit_price = float(menu_item.price)
-                item_total = unit_price * quantity
-                total_amount += item_total
-
-                items_breakdown.append({
-                    'menu_item_id': menu_item.id,
-                    'name': menu_item.name,
-                    'quantity': quantity,
-                    'unit_price': unit_price,
-                    'item_total': item_total
-                })
+        items_breakdown = [{
+            'menu_item_id': line['menu_item_id'],
+            'name': line['name'],
+            'quantity': line['quantity'],
+            'unit_price': float(line['unit_price']),
+            'item_total': float(line['line_total'])
+        } for line in order_lines]
 
         return jsonify({
-            'estimated_total': total_amount,
+            'estimated_total': float(total_amount),
             'items_breakdown': items_breakdown,
             'item_count': len(items_breakdown)
         }), 200
 
+    except PricingError as e:
+        return jsonify({'error': str(e)}), e.status_code
     except Exception as e:
         current_app.logger.error(f'Error calculating order total: {str(e)}')
         return jsonify({'error': 'Internal server error'}), 500
@@ -358,16 +471,27 @@ def order_details(order_id):
         current_user_id = get_jwt_identity()
         user = User.query.get(current_user_id)
 
+        # GET loads the order with its caterer (joined) and items with their
+        # menu items (one selectin query), so large orders cost the same
+        order_query = Order.query
+        if request.method == 'GET':
+            order_query = order_query.options(
+                joinedload(Order.caterer).load_only(CatererProfile.id, CatererProfile.business_name),
+                selectinload(Order.order_items).joinedload(OrderItem.menu_item).load_only(
+                    MenuItem.id, MenuItem.name, MenuItem.description
+                )
+            )
+
         # Find order with access control
         if user.role == UserRole.CLIENT:
-            order = Order.query.filter_by(id=order_id, client_id=current_user_id).first()
+            order = order_query.filter_by(id=order_id, client_id=current_user_id).first()
         elif user.role == UserRole.CATERER:
-            order = Order.query.filter_by(
+            order = order_query.filter_by(
                 id=order_id,
                 caterer_id=user.caterer_profile.id
             ).first()
         else:  # ADMIN
-            order = Order.query.get(order_id)
+            order = order_query.filter_by(id=order_id).first()
 
         if not order:
             return jsonify({'error': 'Order not found'}), 404
@@ -375,28 +499,15 @@ def order_details(order_id):
         # Handle GET request - Get order details
         if request.method == 'GET':
             # Get caterer business name safely
-            caterer = CatererProfile.query.get(order.caterer_id)
-            caterer_business_name = caterer.business_name if caterer else None
-
-            # Parse notes to extract client info (for regular orders)
-            client_info = {}
-            dietary_requirements = []
-            delivery_location = ""
-
-            if order.notes:
-                for line in order.notes.split('\n'):
-                    if line.startswith('CLIENT:'):
-                        client_info['full_name'] = line.replace('CLIENT:', '').strip()
-                    elif line.startswith('EMAIL:'):
-                        client_info['email'] = line.replace('EMAIL:', '').strip()
-                    elif line.startswith('PHONE:'):
-                        client_info['phone_number'] = line.replace('PHONE:', '').strip()
-                    elif line.startswith('DELIVERY:'):
-                        delivery_location = line.replace('DELIVERY:', '').strip()
-                    elif line.startswith('DIETARY:'):
-                        dietary_str = line.replace('DIETARY:', '').strip()
-                        if dietary_str:
-                            dietary_requirements = [req.strip() for req in dietary_str.split(',')]
+            caterer_business_name = order.caterer.business_name if order.caterer else None
+
+            client_info = {
+                key: value for key, value in (
+                    ('full_name', order.contact_name),
+                    ('email', order.contact_email),
+                    ('phone_number', order.contact_phone),
+                ) if value
+            }
 
             order_data = {
                 'id': order.id,
@@ -411,8 +522,9 @@ def order_details(order_id):
                 'updated_at': order.updated_at.isoformat() if order.updated_at else None,
                 'caterer_business_name': caterer_business_name,
                 'client_info': client_info,
-                'delivery_location': delivery_location,
-                'dietary_requirements': dietary_requirements,
+                'delivery_location': order.delivery_address or "",
+                'dietary_requirements': order.dietary_requirements or [],
+                'notes': order.notes or "",
                 'order_items': []
             }
 
@@ -420,6 +532,7 @@ def order_details(order_id):
             if order.is_catering_order():
                 order_data.update({
                     'event_name': order.event_name,
+                    'event_type': order.event_type,
                     'event_date': order.event_date.isoformat() if order.event_date else None,
                     'event_time': order.event_time.strftime('%H:%M') if order.event_time else None,
                     'delivery_address': order.delivery_address,
@@ -433,7 +546,7 @@ def order_details(order_id):
             # Add order items
             for item in order.order_items:
                 # Get menu item details safely
-                menu_item = MenuItem.query.get(item.menu_item_id)
+                menu_item = item.menu_item
 
                 item_data = {
                     'id': item.id,
@@ -468,8 +581,19 @@ def order_details(order_id):
             if not data:
                 return jsonify({'error': 'No data provided'}), 400
 
+            # Validated up front: it feeds the daily revenue rollups, which must hold cents
+            final_total = data.get('final_total')
+            if final_total is not None:
+                try:
+                    final_total = parse_price(final_total)
+                except ValueError:
+                    return jsonify({'error': 'final_total must be a number between 0 and 99999999.99'}), 400
+
             # Track what was updated for response
             updated_fields = []
+            stats_before = order_stats_contribution(order)
+            rankings_changed = False
+            suggestions_changed = False
 
             # Update status if provided
             if 'status' in data:
@@ -480,11 +604,16 @@ def order_details(order_id):
                     order.updated_at = datetime.utcnow()
                     updated_fields.append('status')
 
-                    # Set confirmed_at if status changed to CONFIRMED
-                    if new_status == OrderStatus.CONFIRMED and old_status != OrderStatus.CONFIRMED:
+                    # Set confirmed_at if status changed to CONFIRMED (moving back from
+                    # preparing etc. keeps the original confirmation time)
+                    if new_status == OrderStatus.CONFIRMED and old_status not in COUNTED_ORDER_STATUSES:
                         order.confirmed_at = datetime.utcnow()
                         updated_fields.append('confirmed_at')
 
+                    # Keep the per-item popularity buckets in step with confirmations
+                    rankings_changed = record_order_status_change(order, old_status)
+                    suggestions_changed = record_order_completion(order, old_status)
+
                     # Set delivery_date if status changed to OUT_FOR_DELIVERY
                     if new_status == OrderStatus.OUT_FOR_DELIVERY and not order.delivery_date:
                         order.delivery_date = datetime.utcnow()
@@ -496,7 +625,7 @@ def order_details(order_id):
             # Update financial fields if provided (caterers only)
             if user.role in [UserRole.CATERER, UserRole.ADMIN]:
                 if 'final_total' in data:
-                    order.final_total = data['final_total']
+                    order.final_total = final_total
                     order.updated_at = datetime.utcnow()
                     updated_fields.append('final_total')
 
@@ -512,8 +641,15 @@ def order_details(order_id):
                     order.updated_at = datetime.utcnow()
                     updated_fields.append('delivery_instructions')
 
+            # Move the order between the caterer's daily stats rows
+            record_order_stats_change(stats_before, order)
             db.session.commit()
 
+            if rankings_changed:
+                refresh_menu_rankings_if_stale()
+            if suggestions_changed:
+                bump_suggestions_version()
+
             return jsonify({
                 'message': 'Order updated successfully',
                 'updated_fields': updated_fields,
@@ -535,7 +671,64 @@ def order_details(order_id):
 # - get_orders (with filtering)
 # - update_order_status
 # - update_order
-# - get_order_stats
+
+
+@order_bp.route('/stats', methods=['GET'])
+@jwt_required()
+def get_order_stats():
+    """
+    Order statistics for the caterer dashboard, from the daily rollups
+    Query params:
+    - from / to: date range YYYY-MM-DD, inclusive (default the last 30 days)
+    - period: day (default), week or month for revenue_by_period
+    - top_items: number of best selling items (default 10, max 50)
+    - caterer_id: required for admins, caterers always get their own stats
+    """
+    try:
+        current_user_id = get_jwt_identity()
+        user = User.query.get(current_user_id)
+
+        if user.role == UserRole.CATERER:
+            if not user.caterer_profile:
+                return jsonify({'error': 'Caterer profile not found'}), 404
+            caterer_id = user.caterer_profile.id
+        elif user.role == UserRole.ADMIN:
+            caterer_id = request.args.get('caterer_id', type=int)
+            if not caterer_id:
+                return jsonify({'error': 'caterer_id is required'}), 400
+        else:
+            return jsonify({'error': 'Only caterers can view order statistics'}), 403
+
+        try:
+            end = datetime.strptime(request.args['to'], '%Y-%m-%d').date() if request.args.get('to') \
+                else datetime.utcnow().date()
+            start = datetime.strptime(request.args['from'], '%Y-%m-%d').date() if request.args.get('from') \
+                else end - timedelta(days=29)
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        if start > end:
+            return jsonify({'error': 'from must not be after to'}), 400
+
+        period = request.args.get('period', 'day')
+        if period not in STATS_PERIODS:
+            return jsonify({'error': f"period must be one of {', '.join(STATS_PERIODS)}"}), 400
+
+        stats = caterer_order_stats(
+            caterer_id, start, end, period=period,
+            top_items=parse_limit(request.args.get('top_items'), default=10, maximum=50)
+        )
+
+        return jsonify({
+            'caterer_id': caterer_id,
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'period': period,
+            **stats
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f'Error fetching order stats: {str(e)}')
+        return jsonify({'error': 'Internal server error'}), 500
 
 
 # CART MANAGEMENT ENDPOINTS
@@ -567,61 +760,33 @@ def add_to_cart():
         if not menu_item:
             return jsonify({'error': 'Menu item not found or not available'}), 404
 
-        # Find or create pending order (cart)
-        pending_order = Order.query.filter_by(
-            client_id=current_user_id,
-            status=OrderStatus.DRAFT
-        ).first()
+        quantity = parse_quantity(data.get('quantity', 1))
 
-        if not pending_order:
-            pending_order = Order(
-                order_number=generate_order_number(),
-                client_id=current_user_id,
-                caterer_id=menu_item.caterer_id,
-                total_amount=0,
-                estimated_total=0,
-                status=OrderStatus.DRAFT
-            )
-            db.session.add(pending_order)
-            db.session.flush()
-
-        # Check if item already in cart
-        existing_item = OrderItem.query.filter_by(
-            order_id=pending_order.id,
-            menu_item_id=data['menu_item_id'],
-            customization=data.get('customization', '')
-        ).first()
-
-        if existing_item:
-            existing_item.quantity += data.get('quantity', 1)
-        else:
-            # Add new item to cart
-            order_item = OrderItem(
-                order_id=pending_order.id,
-                menu_item_id=data['menu_item_id'],
-                quantity=data.get('quantity', 1),
-                unit_price=menu_item.price,
+        def add(cart):
+            add_cart_item(
+                cart,
+                menu_item.id,
+                menu_item.caterer_id,
+                Decimal(menu_item.price),
+                quantity,
                 customization=data.get('customization', ''),
                 servings_per_unit=data.get('servings_per_unit', 1),
                 special_instructions=data.get('special_instructions', '')
             )
-            db.session.add(order_item)
+            return cart
 
-        # Update order totals
-        pending_order.total_amount = sum(
-            float(item.unit_price) * item.quantity for item in pending_order.order_items
-        )
-        pending_order.estimated_total = pending_order.total_amount
-
-        db.session.commit()
+        # The cart lives in the cart store, no orders rows until checkout
+        cart = carts.update(current_user_id, add)
 
         return jsonify({
             'success': True,
             'message': 'Item added to cart',
-            'cart_count': sum(item.quantity for item in pending_order.order_items),
-            'order_total': float(pending_order.total_amount)
+            'cart_count': cart['item_count'],
+            'order_total': float(Decimal(cart['total']))
         }), 200
 
+    except PricingError as e:
+        return jsonify({'error': str(e)}), e.status_code
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f'Error adding to cart: {str(e)}')
@@ -637,53 +802,105 @@ def get_cart():
     try:
         current_user_id = get_jwt_identity()
 
-        pending_order = Order.query.filter_by(
-            client_id=current_user_id,
-            status=OrderStatus.DRAFT
-        ).options(
-            joinedload(Order.order_items).joinedload(OrderItem.menu_item)
-        ).first()
-
-        if not pending_order:
-            return jsonify({
+        # Cheap version check first: cart version + catalogue version (names, images),
+        # only when the cache versions are shared by every worker
+        cart = carts.get(current_user_id)
+        etag = make_etag(
+            'cart', current_user_id,
+            cart['version'] if cart else None,
+            cart['updated_at'] if cart else None,
+            cache.get_version(),
+            cache.get_version(SUGGESTIONS_VERSION)
+        ) if cache.shares_versions else None
+        response = not_modified(etag)
+        if response is not None:
+            return response
+
+        if not cart:
+            return with_etag(jsonify({
                 'items': [],
                 'total': 0,
                 'cart_count': 0,
-                'caterer_id': None
-            }), 200
+                'caterer_id': None,
+                'suggestions': []
+            }), etag)
+
+        # Names and images of the cart's menu items in one query
+        menu_items = {
+            menu_item.id: menu_item for menu_item in MenuItem.query.options(
+                load_only(MenuItem.id, MenuItem.name, MenuItem.description, MenuItem.image_url)
+            ).filter(MenuItem.id.in_({item['menu_item_id'] for item in cart['items']}))
+        }
+        caterer = db.session.get(CatererProfile, cart['caterer_id']) if cart['caterer_id'] else None
 
         cart_items = []
-        for item in pending_order.order_items:
-            menu_item = item.menu_item
+        for item in cart['items']:
+            menu_item = menu_items.get(item['menu_item_id'])
+            unit_price = Decimal(item['unit_price'])
             cart_items.append({
-                'id': item.id,
-                'menu_item_id': item.menu_item_id,
-                'name': menu_item.name,
-                'description': menu_item.description,
-                'price': float(item.unit_price),
-                'quantity': item.quantity,
-                'customization': item.customization,
-                'servings_per_unit': item.servings_per_unit,
-                'special_instructions': item.special_instructions,
-                'image_url': menu_item.image_url,
-                'subtotal': float(item.unit_price * item.quantity),
-                'total_servings': item.total_servings()
+                'id': item['id'],
+                'menu_item_id': item['menu_item_id'],
+                'name': menu_item.name if menu_item else None,
+                'description': menu_item.description if menu_item else None,
+                'price': float(unit_price),
+                'quantity': item['quantity'],
+                'customization': item['customization'],
+                'servings_per_unit': item['servings_per_unit'],
+                'special_instructions': item['special_instructions'],
+                'image_url': menu_item.image_url if menu_item else None,
+                'subtotal': float(unit_price * item['quantity']),
+                'total_servings': item['quantity'] * (item['servings_per_unit'] or 1)
             })
 
-        return jsonify({
-            'order_id': pending_order.id,
+        return with_etag(jsonify({
+            'order_id': None,  # carts become orders at convert-to-order
             'items': cart_items,
-            'total': float(pending_order.total_amount),
-            'cart_count': sum(item.quantity for item in pending_order.order_items),
-            'caterer_id': pending_order.caterer_id,
-            'caterer_business_name': pending_order.caterer.business_name if pending_order.caterer else None
-        }), 200
+            'total': float(Decimal(cart['total'])),
+            'cart_count': cart['item_count'],
+            'caterer_id': cart['caterer_id'],
+            'caterer_business_name': caterer.business_name if caterer else None,
+            'suggestions': serialize_suggestions(suggest_menu_items(
+                {item['menu_item_id'] for item in cart_items}, fields=SUGGESTION_FIELDS
+            ))
+        }), etag)
 
     except Exception as e:
         current_app.logger.error(f'Error getting cart: {str(e)}')
         return jsonify({'error': 'Internal server error'}), 500
 
 
+def serialize_suggestions(suggestions):
+    return [dict(menu_item.to_dict(SUGGESTION_FIELDS), score=score) for menu_item, score in suggestions]
+
+
+@order_bp.route('/cart/suggestions', methods=['GET'])
+@jwt_required()
+def get_cart_suggestions():
+    """
+    "Frequently ordered together" items for the current cart
+    Query params:
+    - menu_item_id: suggest for these items instead of the cart (repeatable)
+    - limit: number of suggestions (default CART_SUGGESTION_LIMIT, max 20)
+    """
+    try:
+        current_user_id = get_jwt_identity()
+
+        item_ids = request.args.getlist('menu_item_id', type=int)
+        if not item_ids:
+            cart = carts.get(current_user_id)
+            item_ids = list({item['menu_item_id'] for item in cart['items']}) if cart else []
+
+        limit = parse_limit(request.args.get('limit'), default=current_app.config.get('CART_SUGGESTION_LIMIT', 5),
+                            maximum=20)
+        suggestions = suggest_menu_items(item_ids, limit=limit, fields=SUGGESTION_FIELDS)
+
+        return jsonify({'suggestions': serialize_suggestions(suggestions)}), 200
+
+    except Exception as e:
+        current_app.logger.error(f'Error getting cart suggestions: {str(e)}')
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 @order_bp.route('/cart/update', methods=['POST'])
 @jwt_required()
 def update_cart_item():
@@ -701,39 +918,31 @@ def update_cart_item():
         if 'item_id' not in data or 'quantity' not in data:
             return jsonify({'error': 'item_id and quantity are required'}), 400
 
-        # Find the order item
-        order_item = OrderItem.query.join(Order).filter(
-            OrderItem.id == data['item_id'],
-            Order.client_id == current_user_id,
-            Order.status == OrderStatus.DRAFT
-        ).first()
-
-        if not order_item:
+        # Remove the item when the quantity drops to 0 (or below)
+        quantity = data['quantity']
+        quantity = 0 if isinstance(quantity, (int, float)) and quantity <= 0 else parse_quantity(quantity)
+        try:
+            item_id = int(data['item_id'])
+        except (TypeError, ValueError):
             return jsonify({'error': 'Cart item not found'}), 404
 
-        if data['quantity'] <= 0:
-            # Remove item from cart
-            db.session.delete(order_item)
-        else:
-            # Update quantity
-            order_item.quantity = data['quantity']
-
-        # Update order totals
-        order = order_item.order
-        order.total_amount = sum(
-            float(item.unit_price) * item.quantity for item in order.order_items
-        )
-        order.estimated_total = order.total_amount
+        def set_quantity(cart):
+            set_cart_item_quantity(cart, item_id, quantity)
+            return cart
 
-        db.session.commit()
+        cart = carts.update(current_user_id, set_quantity)
 
         return jsonify({
             'success': True,
             'message': 'Cart updated successfully',
-            'order_total': float(order.total_amount),
-            'cart_count': sum(item.quantity for item in order.order_items)
+            'order_total': float(Decimal(cart['total'])),
+            'cart_count': cart['item_count']
         }), 200
 
+    except CartItemNotFound:
+        return jsonify({'error': 'Cart item not found'}), 404
+    except PricingError as e:
+        return jsonify({'error': str(e)}), e.status_code
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f'Error updating cart: {str(e)}')
@@ -749,17 +958,7 @@ def clear_cart():
     try:
         current_user_id = get_jwt_identity()
 
-        pending_order = Order.query.filter_by(
-            client_id=current_user_id,
-            status=OrderStatus.DRAFT
-        ).first()
-
-        if pending_order:
-            # Delete all order items
-            OrderItem.query.filter_by(order_id=pending_order.id).delete()
-            pending_order.total_amount = 0
-            pending_order.estimated_total = 0
-            db.session.commit()
+        carts.delete(current_user_id)
 
         return jsonify({
             'success': True,
@@ -811,72 +1010,74 @@ def convert_cart_to_order():
         current_user_id = get_jwt_identity()
         data = request.get_json()
 
-        # Find draft order
-        draft_order = Order.query.filter_by(
-            client_id=current_user_id,
-            status=OrderStatus.DRAFT
-        ).first()
-
-        if not draft_order or not draft_order.order_items.count():
+        cart = carts.get(current_user_id)
+        if not cart or not cart['items']:
             return jsonify({'error': 'Cart is empty'}), 400
 
         order_type = data.get('order_type', 'regular')
 
-        # Build comprehensive notes
-        client_info = data.get('client_info', {})
-        if order_type == 'regular':
-            notes_parts = [
-                f"CLIENT: {client_info.get('full_name', '')}",
-                f"EMAIL: {client_info.get('email', '')}",
-                f"PHONE: {client_info.get('phone_number', '')}",
-                f"DELIVERY: {data.get('delivery_location', '')}",
-                f"DIETARY: {', '.join(data.get('dietary_requirements', []))}",
-                f"NOTES: {data.get('notes', '')}"
-            ]
-            notes = "\n".join([part for part in notes_parts if part.split(': ')[1]])
-        else:
-            # Catering order
-            notes_parts = [
-                f"EVENT: {data.get('event_name', '')}",
-                f"DATE: {data.get('event_date', '')} at {data.get('event_time', '')}",
-                f"GUESTS: {data.get('guest_count', '')}",
-                f"DELIVERY: {data.get('delivery_location', '')}",
-                f"CLIENT: {client_info.get('full_name', '')}",
-                f"EMAIL: {client_info.get('email', '')}",
-                f"PHONE: {client_info.get('phone_number', '')}",
-                f"REQUIREMENTS: {', '.join(data.get('special_requirements', []))}",
-                f"NOTES: {data.get('notes', '')}"
-            ]
-            notes = "\n".join([part for part in notes_parts if part.split(': ')[1]])
-
-        # Update order with final details
-        draft_order.notes = notes
-        draft_order.status = OrderStatus.PENDING
+        # The cart becomes Order/OrderItem rows only now
+        order = Order(
+            order_number=generate_catering_order_number() if order_type == 'catering' else generate_order_number(),
+            client_id=current_user_id,
+            caterer_id=cart['caterer_id'],
+            status=OrderStatus.PENDING
+        )
+        error = apply_contact_details(order, data)
+        if error:
+            return jsonify({'error': error}), 400
 
         # Add catering-specific fields
         if order_type == 'catering':
-            draft_order.event_name = data.get('event_name')
-            draft_order.event_date = datetime.strptime(data['event_date'], '%Y-%m-%d').date() if data.get(
+            order.event_name = data.get('event_name')
+            order.event_date = datetime.strptime(data['event_date'], '%Y-%m-%d').date() if data.get(
                 'event_date') else None
-            draft_order.event_time = datetime.strptime(data['event_time'], '%H:%M').time() if data.get(
+            order.event_time = datetime.strptime(data['event_time'], '%H:%M').time() if data.get(
                 'event_time') else None
-            draft_order.delivery_address = data.get('delivery_location', '')
-            draft_order.guest_count = data.get('guest_count')
-            draft_order.special_requirements = data.get('special_requirements', [])
-            # Update order number for catering
-            draft_order.order_number = generate_catering_order_number()
+            order.guest_count = data.get('guest_count')
+            order.special_requirements = data.get('special_requirements', [])
 
-        db.session.commit()
+        # Take the cart so a double submit can't place it twice
+        cart = carts.pop(current_user_id)
+        if not cart:
+            return jsonify({'error': 'Cart is empty'}), 400
+
+        try:
+            order.total_amount = Decimal(cart['total'])
+            order.estimated_total = order.total_amount
+            order.item_count = cart['item_count']
+            db.session.add(order)
+            db.session.flush()
+
+            db.session.execute(insert(OrderItem), [
+                {
+                    'order_id': order.id,
+                    'menu_item_id': item['menu_item_id'],
+                    'quantity': item['quantity'],
+                    'unit_price': Decimal(item['unit_price']),
+                    'customization': item['customization'],
+                    'servings_per_unit': item['servings_per_unit'],
+                    'special_instructions': item['special_instructions']
+                }
+                for item in cart['items']
+            ])
+
+            record_order_stats_change(None, order)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            carts.restore(current_user_id, cart)
+            raise
 
         return jsonify({
             'success': True,
             'message': 'Order submitted successfully',
             'order': {
-                'id': draft_order.id,
-                'order_number': draft_order.order_number,
+                'id': order.id,
+                'order_number': order.order_number,
                 'order_type': order_type,
-                'total_amount': float(draft_order.total_amount),
-                'status': draft_order.status.value
+                'total_amount': float(order.total_amount),
+                'status': order.status.value
             }
         }), 200
 
@@ -0,0 +1,315 @@
+# app/utils/cache.py
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import current_app, request
+
+from app.utils.http_cache import make_etag, not_modified
+
+CATALOGUE_VERSION = "catalogue"
+PRICE_TABLES = "price-tables"
+
+
+class NullCacheBackend:
+    """Backend that never stores anything (disables caching)"""
+
+    shared = False
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+    def get_version(self, name):
+        # A fresh token every time so ETags derived from it never match
+        return uuid.uuid4().hex
+
+    def bump_version(self, name):
+        return uuid.uuid4().hex
+
+
+class MemoryCacheBackend:
+    """
+    In-process LRU cache with per-entry TTL.
+    Only coherent within a single worker process: versions bumped in one
+    worker are never seen by the others, so no ETags are derived from them.
+    """
+
+    shared = False
+
+    def __init__(self, max_entries=2048, default_ttl=300):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_version(self, name):
+        with self._lock:
+            return self._versions.setdefault(name, uuid.uuid4().hex)
+
+    def bump_version(self, name):
+        with self._lock:
+            version = self._versions[name] = uuid.uuid4().hex
+            return version
+
+
+class FileCacheBackend:
+    """
+    Cache stored as one file per entry in a shared directory, so every
+    worker on the host sees the same entries and versions.
+    Writes go through a temp file + os.replace to stay atomic.
+    Files are touched on read and the least recently used ones are pruned.
+    """
+
+    PRUNE_EVERY = 64
+    shared = True
+
+    def __init__(self, directory, max_entries=2048, default_ttl=300):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries_dir = os.path.join(directory, "entries")
+        self._versions_dir = os.path.join(directory, "versions")
+        self._writes = 0
+        os.makedirs(self._entries_dir, exist_ok=True)
+        os.makedirs(self._versions_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self._entries_dir, hashlib.sha1(key.encode()).hexdigest())
+
+    def _write_atomic(self, path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                expires_at, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+        if expires_at is not None and expires_at < time.time():
+            self.delete(key)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        self._write_atomic(self._path(key), pickle.dumps((expires_at, value), pickle.HIGHEST_PROTOCOL))
+
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self.prune()
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        with os.scandir(self._entries_dir) as entries:
+            for entry in entries:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def prune(self):
+        """Drop the least recently used entries above max_entries"""
+        files = []
+        with os.scandir(self._entries_dir) as entries:
+            for entry in entries:
+                try:
+                    files.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    pass
+
+        excess = len(files) - self.max_entries
+        if excess <= 0:
+            return
+        files.sort()
+        for _, path in files[:excess]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def get_version(self, name):
+        path = os.path.join(self._versions_dir, name)
+        try:
+            with open(path, "r") as f:
+                version = f.read().strip()
+            if version:
+                return version
+        except OSError:
+            pass
+        return self.bump_version(name)
+
+    def bump_version(self, name):
+        version = uuid.uuid4().hex
+        self._write_atomic(os.path.join(self._versions_dir, name), version.encode())
+        return version
+
+
+class ResponseCache:
+    """
+    Flask extension caching whole JSON responses keyed by path, query
+    parameters and a named version. Bumping the version invalidates every
+    response cached under it.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend_name = app.config.get("RESPONSE_CACHE_BACKEND", "memory")
+        directory = app.config.get("RESPONSE_CACHE_DIR", os.path.join(app.instance_path, "cache"))
+
+        def make_backend(directory, max_entries, default_ttl):
+            if backend_name == "file":
+                return FileCacheBackend(directory, max_entries=max_entries, default_ttl=default_ttl)
+            if backend_name == "memory":
+                return MemoryCacheBackend(max_entries=max_entries, default_ttl=default_ttl)
+            return NullCacheBackend()
+
+        app.extensions["response_cache"] = make_backend(
+            directory,
+            app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 2048),
+            app.config.get("RESPONSE_CACHE_TTL", 300)
+        )
+        # Cached data other than responses gets its own entries and size bound,
+        # so it never evicts the responses
+        app.extensions["cache_namespaces"] = {
+            PRICE_TABLES: make_backend(
+                os.path.join(directory, PRICE_TABLES),
+                app.config.get("PRICE_TABLE_CACHE_MAX_ENTRIES", 512),
+                app.config.get("PRICE_TABLE_CACHE_TTL", 300)
+            ),
+        }
+
+    @property
+    def backend(self):
+        return current_app.extensions["response_cache"]
+
+    def namespace(self, name):
+        """Backend of a separate namespace, e.g. PRICE_TABLES"""
+        return current_app.extensions["cache_namespaces"][name]
+
+    @property
+    def shares_versions(self):
+        """True when every worker sees the same versions, so ETags derived from them stay valid"""
+        return self.backend.shared
+
+    def get_version(self, name=CATALOGUE_VERSION):
+        return self.backend.get_version(name)
+
+    def bump_version(self, name=CATALOGUE_VERSION):
+        return self.backend.bump_version(name)
+
+    def request_key(self, version):
+        """Cache key for the current request under the given version"""
+        args = urlencode(sorted(request.args.items(multi=True)))
+        return f"response:{version}:{request.path}?{args}"
+
+    def cached(self, version_name=CATALOGUE_VERSION, ttl=None, cache_control="public, no-cache"):
+        """
+        Cache successful JSON responses of a GET view.
+        With a backend shared by the workers (see shares_versions), responses
+        carry a strong ETag derived from the cache key, and a matching
+        If-None-Match is answered with 304 before any lookup.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                backend = self.backend
+                key = self.request_key(backend.get_version(version_name))
+                etag = make_etag(key) if backend.shared else None
+
+                response = not_modified(etag, cache_control)
+                if response is not None:
+                    return response
+
+                hit = backend.get(key)
+                if hit is not None:
+                    body, status = hit
+                    response = current_app.response_class(body, status=status, mimetype="application/json")
+                    response.headers["X-Cache"] = "HIT"
+                else:
+                    response = current_app.make_response(view(*args, **kwargs))
+                    if response.status_code == 200:
+                        backend.set(key, (response.get_data(), response.status_code), ttl)
+                    response.headers["X-Cache"] = "MISS"
+
+                if response.status_code == 200 and etag is not None:
+                    response.set_etag(etag)
+                    response.headers["Cache-Control"] = cache_control
+                return response
+            return wrapper
+        return decorator
+
+
+def bump_catalogue_version():
+    """Invalidate every cached catalogue response (call after commit)"""
+    from app.extensions import cache
+    return cache.bump_version(CATALOGUE_VERSION)
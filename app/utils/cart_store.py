@@ -0,0 +1,333 @@
+# app/utils/cart_store.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from decimal import Decimal
+
+from flask import current_app
+
+CART_KEY_PREFIX = "cart:"
+
+
+class CartItemNotFound(LookupError):
+    """Raised when a cart item id is not in the cart"""
+
+
+class MemoryCartBackend:
+    """
+    Carts held in a process-local dict with per-entry TTL.
+    Only coherent within a single worker process (development, tests).
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _load(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at < time.time():
+            del self._entries[key]
+            return None
+        return json.loads(value)
+
+    def get(self, key):
+        with self._lock:
+            return self._load(key)
+
+    def update(self, key, mutate, ttl):
+        with self._lock:
+            value, result = mutate(self._load(key))
+            if value is None:
+                self._entries.pop(key, None)
+            else:
+                self._entries[key] = (time.time() + ttl if ttl else None, json.dumps(value))
+            return result
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class SQLiteCartBackend:
+    """
+    Carts stored as JSON in a local SQLite file, shared by every worker on the
+    host and kept out of the orders tables. Updates run in BEGIN IMMEDIATE
+    transactions so concurrent requests for one cart serialize.
+    """
+
+    PRUNE_EVERY = 256
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS carts (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _load(self, conn, key):
+        row = conn.execute(
+            "SELECT value FROM carts WHERE key = ? AND (expires_at IS NULL OR expires_at >= ?)",
+            (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get(self, key):
+        return self._load(self._connect(), key)
+
+    def update(self, key, mutate, ttl):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            value, result = mutate(self._load(conn, key))
+            if value is None:
+                conn.execute("DELETE FROM carts WHERE key = ?", (key,))
+            else:
+                conn.execute(
+                    "INSERT OR REPLACE INTO carts (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), time.time() + ttl if ttl else None)
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self.prune()
+        return result
+
+    def delete(self, key):
+        self._connect().execute("DELETE FROM carts WHERE key = ?", (key,))
+
+    def prune(self):
+        """Drop abandoned carts past their TTL"""
+        self._connect().execute("DELETE FROM carts WHERE expires_at < ?", (time.time(),))
+
+
+class RedisCartBackend:
+    """
+    Carts stored as JSON strings in Redis (or anything speaking its protocol),
+    expiring with the key TTL. Updates use WATCH/MULTI and retry on conflicts.
+    """
+
+    def __init__(self, url):
+        import redis
+
+        self._watch_error = redis.WatchError
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        raw = self.client.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def update(self, key, mutate, ttl):
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    raw = pipe.get(key)
+                    value, result = mutate(json.loads(raw) if raw is not None else None)
+                    pipe.multi()
+                    if value is None:
+                        pipe.delete(key)
+                    else:
+                        pipe.set(key, json.dumps(value), ex=ttl or None)
+                    pipe.execute()
+                    return result
+                except self._watch_error:
+                    continue
+
+    def delete(self, key):
+        self.client.delete(key)
+
+
+def new_cart():
+    return {
+        "caterer_id": None,
+        "items": [],
+        "next_item_id": 1,
+        "total": "0",  # Decimal as a string, kept exact
+        "item_count": 0,
+        "version": 0,  # bumped on every change, for ETags
+        "updated_at": None,
+    }
+
+
+def _adjust(cart, amount_delta, count_delta):
+    cart["total"] = str(Decimal(cart["total"]) + amount_delta)
+    cart["item_count"] += count_delta
+    cart["version"] += 1
+    cart["updated_at"] = datetime.utcnow().isoformat()
+
+
+def add_cart_item(cart, menu_item_id, caterer_id, unit_price, quantity, customization="",
+                  servings_per_unit=1, special_instructions=""):
+    """Add a line (or more of an identical one) to a cart dict, returns the line"""
+    if cart["caterer_id"] is None:
+        cart["caterer_id"] = caterer_id
+
+    for item in cart["items"]:
+        if item["menu_item_id"] == menu_item_id and item["customization"] == customization:
+            # Priced at the unit price it was added with
+            item["quantity"] += quantity
+            _adjust(cart, Decimal(item["unit_price"]) * quantity, quantity)
+            return item
+
+    item = {
+        "id": cart["next_item_id"],
+        "menu_item_id": menu_item_id,
+        "quantity": quantity,
+        "unit_price": str(unit_price),
+        "customization": customization,
+        "servings_per_unit": servings_per_unit,
+        "special_instructions": special_instructions,
+    }
+    cart["next_item_id"] += 1
+    cart["items"].append(item)
+    _adjust(cart, Decimal(unit_price) * quantity, quantity)
+    return item
+
+
+def set_cart_item_quantity(cart, item_id, quantity):
+    """Change a line's quantity, 0 removes it. Raises CartItemNotFound"""
+    for index, item in enumerate(cart["items"]):
+        if item["id"] == item_id:
+            count_delta = quantity - item["quantity"]
+            if quantity == 0:
+                del cart["items"][index]
+            else:
+                item["quantity"] = quantity
+            _adjust(cart, Decimal(item["unit_price"]) * count_delta, count_delta)
+            if not cart["items"]:
+                cart["caterer_id"] = None
+            return
+    raise CartItemNotFound(item_id)
+
+
+class CartStore:
+    """
+    Flask extension keeping shopping carts outside the database until they
+    are converted to an order. Backends: "sqlite" (a local file shared by the
+    workers on one host), "redis" (CART_STORE_URL) or "memory" (one process).
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend_name = app.config.get("CART_STORE_BACKEND", "sqlite")
+
+        if backend_name == "redis":
+            backend = RedisCartBackend(app.config.get("CART_STORE_URL", "redis://localhost:6379/0"))
+        elif backend_name == "memory":
+            backend = MemoryCartBackend()
+        else:
+            backend = SQLiteCartBackend(
+                app.config.get("CART_STORE_PATH", os.path.join(app.instance_path, "carts.sqlite3"))
+            )
+
+        app.extensions["cart_store"] = backend
+
+    @property
+    def backend(self):
+        return current_app.extensions["cart_store"]
+
+    @staticmethod
+    def _key(user_id):
+        return f"{CART_KEY_PREFIX}{user_id}"
+
+    def get(self, user_id):
+        """The user's cart dict, None if they have none"""
+        return self.backend.get(self._key(user_id))
+
+    def update(self, user_id, mutate):
+        """
+        Apply mutate(cart) to the user's cart (a new one if they have none)
+        atomically and return its result. Carts left empty are dropped.
+        """
+        def apply(cart):
+            cart = cart or new_cart()
+            result = mutate(cart)
+            return (cart if cart["items"] else None), result
+
+        ttl = int(current_app.config.get("CART_TTL_DAYS", 30) * 86400)
+        return self.backend.update(self._key(user_id), apply, ttl)
+
+    def delete(self, user_id):
+        self.backend.delete(self._key(user_id))
+
+    def pop(self, user_id):
+        """Remove and return the user's cart in one step, None if they have none"""
+        def take(cart):
+            taken = json.loads(json.dumps(cart)) if cart["items"] else None
+            cart["items"] = []
+            return taken
+
+        return self.update(user_id, take)
+
+    def restore(self, user_id, popped):
+        """Put back a popped cart (checkout failed) unless the user already started a new one"""
+        def put_back(cart):
+            if not cart["items"]:
+                cart.clear()
+                cart.update(popped)
+
+        self.update(user_id, put_back)
+
+
+def import_draft_orders(batch_size=500):
+    """
+    Move carts still stored as DRAFT orders into the cart store and delete the
+    rows (one-off, after switching to the cart store). A user's existing store
+    cart wins over their draft order.
+    """
+    from app.extensions import carts, db
+    from app.models import Order, OrderItem, OrderStatus
+    from sqlalchemy.orm import selectinload
+
+    moved = 0
+    while True:
+        drafts = (
+            Order.query.options(selectinload(Order.order_items))
+            .filter(Order.status == OrderStatus.DRAFT)
+            .order_by(Order.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not drafts:
+            return moved
+
+        for draft in drafts:
+            def restore(cart, draft=draft):
+                if cart["items"]:
+                    return False
+                for item in draft.order_items:
+                    add_cart_item(cart, item.menu_item_id, draft.caterer_id, Decimal(item.unit_price or 0),
+                                  item.quantity, item.customization or "", item.servings_per_unit or 1,
+                                  item.special_instructions or "")
+                return True
+
+            if carts.update(draft.client_id, restore):
+                moved += 1
+
+        draft_ids = [draft.id for draft in drafts]
+        OrderItem.query.filter(OrderItem.order_id.in_(draft_ids)).delete(synchronize_session=False)
+        Order.query.filter(Order.id.in_(draft_ids)).delete(synchronize_session=False)
+        db.session.commit()
@@ -0,0 +1,84 @@
+# app/utils/dietary_tags.py
+import json
+from sqlalchemy import select, delete, insert, func
+from app.extensions import db
+from app.models import MenuItem, MenuItemDietaryTag
+
+MAX_TAG_LENGTH = 50
+
+
+def normalize_dietary_tags(tags):
+    """
+    Normalize dietary tags to a de-duplicated list of lowercase strings.
+    Accepts a list, a JSON array string or a comma separated string.
+    """
+    if not tags:
+        return []
+
+    if isinstance(tags, str):
+        try:
+            tags = json.loads(tags)
+        except ValueError:
+            tags = tags.split(',')
+        if isinstance(tags, str):
+            tags = [tags]
+
+    if not isinstance(tags, (list, tuple)):
+        return []
+
+    normalized = []
+    for tag in tags:
+        if not isinstance(tag, str):
+            continue
+        tag = tag.strip().lower()[:MAX_TAG_LENGTH]
+        if tag and tag not in normalized:
+            normalized.append(tag)
+    return normalized
+
+
+def sync_dietary_tags(tags_by_item):
+    """
+    Replace the indexed tag rows for the given items.
+    `tags_by_item` maps menu item id -> list of tags. Runs in the caller's transaction.
+    """
+    if not tags_by_item:
+        return
+
+    db.session.execute(
+        delete(MenuItemDietaryTag).where(MenuItemDietaryTag.menu_item_id.in_(list(tags_by_item)))
+    )
+
+    rows = [
+        {"menu_item_id": item_id, "tag": tag}
+        for item_id, tags in tags_by_item.items()
+        for tag in normalize_dietary_tags(tags)
+    ]
+    if rows:
+        db.session.execute(insert(MenuItemDietaryTag), rows)
+
+
+def parse_dietary_tag_args(args):
+    """Read dietary tags from ?dietary_tag=a&dietary_tag=b or ?dietary_tag=a,b"""
+    tags = []
+    for value in args.getlist("dietary_tag"):
+        tags.extend(value.split(','))
+    return normalize_dietary_tags(tags)
+
+
+def filter_by_dietary_tags(query, tags, match="all"):
+    """
+    Restrict a MenuItem query to items carrying the given tags.
+    match="all" requires every tag, match="any" requires at least one.
+    Both resolve through the (tag, menu_item_id) index.
+    """
+    tags = normalize_dietary_tags(tags)
+    if not tags:
+        return query
+
+    tagged = select(MenuItemDietaryTag.menu_item_id).where(MenuItemDietaryTag.tag.in_(tags))
+    if match != "any" and len(tags) > 1:
+        tagged = tagged.group_by(MenuItemDietaryTag.menu_item_id).having(
+            func.count(MenuItemDietaryTag.tag) == len(tags)
+        )
+
+    return query.filter(MenuItem.id.in_(tagged))
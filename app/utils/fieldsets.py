@@ -0,0 +1,26 @@
+# app/utils/fieldsets.py
+
+
+class InvalidFields(ValueError):
+    """Raised when ?fields= names a field the endpoint doesn't serialize"""
+
+
+def parse_fields(value, allowed):
+    """
+    Parse a sparse fieldset such as "id,name,price".
+    Returns None when no fieldset was requested (serialize everything).
+    """
+    if not value:
+        return None
+
+    fields = []
+    for field in value.split(','):
+        field = field.strip()
+        if not field:
+            continue
+        if field not in allowed:
+            raise InvalidFields(f"Unknown field: {field}")
+        if field not in fields:
+            fields.append(field)
+
+    return fields or None
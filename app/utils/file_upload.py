@@ -1,9 +1,17 @@
 # app/utils/file_upload.py
+import hashlib
 import os
-import uuid
-from werkzeug.utils import secure_filename
+import re
+import tempfile
 from flask import current_app
 
+from app.utils.image_processing import variant_filename
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+# <sha256>.<ext> originals and <sha256>_<variant>.webp variants
+CONTENT_ADDRESSED_FILENAME = re.compile(r"^[0-9a-f]{64}(_[a-z]+)?\.[a-z]+$")
+
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
@@ -11,22 +19,59 @@ def allowed_file(filename):
         filename.rsplit('.', 1)[1].lower() in {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 
 
+def is_content_addressed(filename):
+    """True when the filename is derived from the file's bytes, so it never changes"""
+    return bool(CONTENT_ADDRESSED_FILENAME.match(filename))
+
+
+def _touch_upload(file_path):
+    variants = [
+        os.path.join(os.path.dirname(file_path), variant_filename(os.path.basename(file_path), variant))
+        for variant in current_app.config.get('IMAGE_VARIANT_SIZES', {})
+    ]
+    for path in [file_path] + variants:
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+
 def save_menu_item_image(file):
-    """Save uploaded image and return the file path"""
+    """
+    Save uploaded image under the SHA-256 of its bytes and return its URL.
+    The upload is hashed while it streams to disk, identical images share one file.
+    """
     if file and allowed_file(file.filename):
-        # Generate unique filename
         file_ext = file.filename.rsplit('.', 1)[1].lower()
-        filename = f"{uuid.uuid4().hex}.{file_ext}"
+        if file_ext == 'jpeg':
+            file_ext = 'jpg'
 
         # Ensure upload directory exists
         upload_dir = current_app.config.get('UPLOAD_FOLDER', 'app/static/uploads/menu_items')
         os.makedirs(upload_dir, exist_ok=True)
 
-        # Save file
-        file_path = os.path.join(upload_dir, filename)
-        file.save(file_path)
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=upload_dir, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in iter(lambda: file.stream.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    out.write(chunk)
+
+            filename = f"{digest.hexdigest()}.{file_ext}"
+            file_path = os.path.join(upload_dir, filename)
+
+            # Same bytes already stored: keep the existing file, touching it and its
+            # variants so the upload GC grace period covers the new reference
+            if os.path.exists(file_path):
+                _touch_upload(file_path)
+            else:
+                os.replace(tmp_path, file_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
         # Return relative URL for database storage
         return f"/static/uploads/menu_items/{filename}"
 
-    return None
\ No newline at end of file
+    return None
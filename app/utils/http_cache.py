@@ -0,0 +1,31 @@
+# app/utils/http_cache.py
+import hashlib
+from flask import current_app, request, make_response
+
+
+def make_etag(*parts):
+    """Build a strong ETag value from version parts"""
+    return hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def not_modified(etag, cache_control="private, no-cache"):
+    """
+    Return a 304 response when the client already holds `etag`, else None
+    (always None without an etag). Call this before loading anything so
+    current clients skip the ORM work.
+    """
+    if etag is not None and etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = cache_control
+        return response
+    return None
+
+
+def with_etag(rv, etag, cache_control="private, no-cache"):
+    """Attach the ETag and revalidation headers to a view's return value (none without an etag)"""
+    response = make_response(rv)
+    if response.status_code == 200 and etag is not None:
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = cache_control
+    return response
@@ -0,0 +1,132 @@
+# app/utils/image_processing.py
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from flask import current_app
+from sqlalchemy import update
+
+UPLOAD_URL_PREFIX = "/static/uploads/menu_items/"
+
+_executor = None
+
+
+def is_local_upload(image_url):
+    """True for images stored by save_menu_item_image (not external URLs)"""
+    return bool(image_url) and image_url.startswith(UPLOAD_URL_PREFIX)
+
+
+def upload_path(image_url, upload_dir=None):
+    """Filesystem path of a local upload URL"""
+    upload_dir = upload_dir or current_app.config.get('UPLOAD_FOLDER', 'app/static/uploads/menu_items')
+    return os.path.join(upload_dir, os.path.basename(image_url))
+
+
+def variant_filename(filename, variant):
+    """abc123.jpg -> abc123_thumbnail.webp"""
+    return f"{filename.rsplit('.', 1)[0]}_{variant}.webp"
+
+
+def generate_image_variants(source_path, sizes, quality=80):
+    """
+    Write a resized WebP per entry of `sizes` (name -> longest edge in px)
+    next to the source image and return {name: filename}.
+    Orientation is applied and EXIF/ICC metadata is dropped.
+    Runs in a worker process, so it only deals with paths and plain values.
+    """
+    from PIL import Image, ImageOps
+
+    upload_dir, filename = os.path.split(source_path)
+    variants = {}
+    pending = {}
+
+    for name, max_size in sizes.items():
+        variants[name] = variant_filename(filename, name)
+        if not os.path.exists(os.path.join(upload_dir, variants[name])):
+            pending[name] = max_size
+
+    if not pending:
+        return variants
+
+    with Image.open(source_path) as image:
+        image.seek(0)  # first frame of animated images
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+        for name, max_size in pending.items():
+            variant = image.copy()
+            variant.thumbnail((max_size, max_size), Image.LANCZOS)
+
+            # Write to a temp file and rename so readers never see a partial image
+            fd, tmp_path = tempfile.mkstemp(dir=upload_dir, prefix=".tmp-", suffix=".webp")
+            os.close(fd)
+            try:
+                variant.save(tmp_path, "WEBP", quality=quality, method=4)
+                os.replace(tmp_path, os.path.join(upload_dir, variants[name]))
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    return variants
+
+
+def _get_executor(app):
+    global _executor
+    if _executor is None:
+        workers = app.config.get('IMAGE_PROCESSING_WORKERS', 2)
+        if app.config.get('IMAGE_PROCESSING_MODE', 'process') == 'thread':
+            _executor = ThreadPoolExecutor(max_workers=workers)
+        else:
+            _executor = ProcessPoolExecutor(max_workers=workers)
+    return _executor
+
+
+def record_image_variants(image_url, variants):
+    """Store variant URLs on every menu item using `image_url`"""
+    from app.extensions import db
+    from app.models import MenuItem
+    from app.utils.cache import bump_catalogue_version
+
+    variant_urls = {name: UPLOAD_URL_PREFIX + filename for name, filename in variants.items()}
+    result = db.session.execute(
+        update(MenuItem)
+        .where(MenuItem.image_url == image_url)
+        .values(image_variants=variant_urls, version=MenuItem.version + 1),
+        execution_options={"synchronize_session": False}
+    )
+    db.session.commit()
+
+    if result.rowcount:
+        bump_catalogue_version()
+    return variant_urls
+
+
+def schedule_image_variants(image_url):
+    """
+    Generate variants for a local upload off the request thread and record
+    them on the menu items when done. IMAGE_PROCESSING_MODE=sync runs inline.
+    """
+    if not is_local_upload(image_url):
+        return
+
+    app = current_app._get_current_object()
+    source_path = upload_path(image_url)
+    sizes = app.config.get('IMAGE_VARIANT_SIZES', {'thumbnail': 200, 'medium': 600, 'large': 1200})
+    quality = app.config.get('IMAGE_VARIANT_QUALITY', 80)
+
+    if app.config.get('IMAGE_PROCESSING_MODE', 'process') == 'sync':
+        record_image_variants(image_url, generate_image_variants(source_path, sizes, quality))
+        return
+
+    def on_done(future):
+        try:
+            variants = future.result()
+            with app.app_context():
+                record_image_variants(image_url, variants)
+        except Exception as e:
+            app.logger.error(f'Error generating image variants for {image_url}: {str(e)}')
+
+    future = _get_executor(app).submit(generate_image_variants, source_path, sizes, quality)
+    future.add_done_callback(on_done)
@@ -0,0 +1,60 @@
+# app/utils/media.py
+import mimetypes
+import os
+
+from flask import abort, current_app, request
+from werkzeug.security import safe_join
+from werkzeug.utils import send_file
+
+from app.utils.file_upload import is_content_addressed
+
+IMMUTABLE_MAX_AGE = 31536000  # one year
+
+
+def send_menu_item_image(filename):
+    """
+    Serve an uploaded menu image.
+
+    Content-addressed files get `public, max-age=31536000, immutable`, others
+    revalidate through ETag/Last-Modified. Range requests are answered with 206.
+
+    MEDIA_OFFLOAD hands the transfer to the reverse proxy:
+    - "x-accel-redirect": nginx serves MEDIA_ACCEL_REDIRECT_PREFIX + filename,
+      which needs an internal location aliased to UPLOAD_FOLDER, e.g.
+          location /protected-media/ { internal; alias /srv/caterly/uploads/; }
+    - "x-sendfile": Apache mod_xsendfile / lighttpd read the file themselves
+    """
+    upload_dir = os.path.abspath(current_app.config.get('UPLOAD_FOLDER', 'app/static/uploads/menu_items'))
+    path = safe_join(upload_dir, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    max_age = IMMUTABLE_MAX_AGE if is_content_addressed(filename) else None
+    offload = current_app.config.get('MEDIA_OFFLOAD', '')
+
+    if offload == 'x-accel-redirect':
+        # nginx handles conditional and Range requests for internal redirects
+        response = current_app.response_class(
+            mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        )
+        response.headers['X-Accel-Redirect'] = current_app.config.get(
+            'MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/'
+        ) + filename
+        if max_age:
+            response.cache_control.public = True
+            response.cache_control.max_age = max_age
+        else:
+            response.cache_control.no_cache = True
+    else:
+        response = send_file(
+            path,
+            request.environ,
+            conditional=True,
+            max_age=max_age,
+            use_x_sendfile=offload == 'x-sendfile',
+            response_class=current_app.response_class,
+        )
+
+    if max_age:
+        response.cache_control.immutable = True
+    return response
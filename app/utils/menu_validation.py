@@ -0,0 +1,95 @@
+# app/utils/menu_validation.py
+from decimal import Decimal, InvalidOperation
+from app.utils.dietary_tags import normalize_dietary_tags
+
+MAX_PRICE = Decimal("99999999.99")  # Numeric(10, 2)
+
+
+def parse_bool(value, field="value"):
+    """Accept real booleans and "true"/"false" strings, raises ValueError for anything else"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    raise ValueError(f"{field} must be true or false")
+
+
+def parse_price(value):
+    """Return the price as a 2dp Decimal, raises ValueError"""
+    try:
+        price = Decimal(str(value).strip()).quantize(Decimal("0.01"))
+    except (InvalidOperation, ValueError):
+        raise ValueError("Price must be a number")
+    if not price.is_finite() or price < 0 or price > MAX_PRICE:
+        raise ValueError("Price must be between 0 and 99999999.99")
+    return price
+
+
+def parse_preparation_time(value):
+    """Minutes as an int, or None when empty, raises ValueError"""
+    if value in (None, ''):
+        return None
+    try:
+        minutes = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("preparation_time must be a whole number of minutes")
+    if minutes < 0:
+        raise ValueError("preparation_time must not be negative")
+    return minutes
+
+
+def validate_menu_item_data(data):
+    """
+    Validate menu item input the same way for every write path.
+    Returns (values, error): values are ready for MenuItem(**values),
+    error is a message when the data is invalid.
+    """
+    if not isinstance(data, dict):
+        return None, "Menu item must be an object"
+
+    name = data.get('name')
+    name = name.strip() if isinstance(name, str) else name
+    if not name or data.get('price') in (None, ''):
+        return None, "Name and price are required"
+    if not isinstance(name, str):
+        return None, "name must be a string"
+    if len(name) > 150:
+        return None, "Name must be at most 150 characters"
+
+    category = data.get('category') or None
+    if category is not None and not isinstance(category, str):
+        return None, "category must be a string"
+    if category and len(category) > 100:
+        return None, "Category must be at most 100 characters"
+
+    image_url = data.get('image_url') or None
+    if image_url is not None and not isinstance(image_url, str):
+        return None, "image_url must be a string"
+    if image_url and len(image_url) > 500:
+        return None, "image_url must be at most 500 characters"
+
+    description = data.get('description') or ''
+    if not isinstance(description, str):
+        return None, "description must be a string"
+
+    try:
+        price = parse_price(data.get('price'))
+        preparation_time = parse_preparation_time(data.get('preparation_time'))
+        # Missing or empty (e.g. a blank CSV cell) means false
+        flags = {
+            field: parse_bool(data[field], field) if data.get(field) not in (None, '') else False
+            for field in ('is_trending', 'is_recommended')
+        }
+    except ValueError as e:
+        return None, str(e)
+
+    return {
+        'name': name,
+        'description': description,
+        'price': price,
+        'image_url': image_url,
+        'category': category,
+        'dietary_tags': normalize_dietary_tags(data.get('dietary_tags', [])),
+        'preparation_time': preparation_time,
+        **flags,
+    }, None
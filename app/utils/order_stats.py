@@ -0,0 +1,158 @@
+# app/utils/order_stats.py
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import delete, func, insert
+
+from app.extensions import db
+from app.models import CatererDailyStats, MenuItem, MenuItemDailyOrders, Order, OrderStatus
+from app.utils.rankings import COUNTED_ORDER_STATUSES
+from app.utils.rollups import increment_counters
+
+STATS_KEY_COLUMNS = ["caterer_id", "day", "status"]
+STATS_PERIODS = ("day", "week", "month")
+CENT = Decimal("0.01")
+
+
+def order_stats_contribution(order):
+    """
+    The order's counters in caterer_daily_stats as a rollup row, None for carts
+    (DRAFT orders are not counted until they are placed).
+    """
+    if order.status is None or order.status == OrderStatus.DRAFT:
+        return None
+
+    # Rounded to cents like the Numeric columns, so the deltas match a rebuild
+    revenue = order.final_total if order.final_total is not None else order.total_amount
+    return {
+        "caterer_id": order.caterer_id,
+        "day": (order.created_at or datetime.utcnow()).date(),
+        "status": order.status.value,
+        "order_count": 1,
+        "revenue": Decimal(str(revenue or 0)).quantize(CENT),
+        "guest_count": int(order.guest_count or 0),
+        "guest_order_count": 1 if order.guest_count else 0,
+    }
+
+
+def record_order_stats_change(before, order):
+    """
+    Move the order's counters from `before` (its order_stats_contribution
+    when it was loaded, None for a new order) to its current state.
+    Only touches the affected rollup rows, in the caller's transaction.
+    """
+    after = order_stats_contribution(order)
+    if before == after:
+        return
+
+    counters = [column for column in (after or before) if column not in STATS_KEY_COLUMNS]
+    if before is not None and after is not None and all(before[c] == after[c] for c in STATS_KEY_COLUMNS):
+        # Same row: apply the difference
+        rows = [{**after, **{column: after[column] - before[column] for column in counters}}]
+    else:
+        rows = [row for row in (after,) if row is not None]
+        if before is not None:
+            rows.append({**before, **{column: -before[column] for column in counters}})
+
+    increment_counters(CatererDailyStats, STATS_KEY_COLUMNS, rows)
+
+
+def _period_start(day, period):
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    if period == "month":
+        return day.replace(day=1)
+    return day
+
+
+def caterer_order_stats(caterer_id, start, end, period="day", top_items=10):
+    """
+    Dashboard figures for one caterer between two dates (inclusive), read from
+    the daily rollups: O(days in range) rows, independent of the number of orders.
+    Revenue, guest counts and top items only count confirmed orders (COUNTED_ORDER_STATUSES).
+    """
+    rows = (
+        db.session.query(CatererDailyStats)
+        .filter(CatererDailyStats.caterer_id == caterer_id,
+                CatererDailyStats.day >= start, CatererDailyStats.day <= end)
+        .all()
+    )
+
+    counted = {status.value for status in COUNTED_ORDER_STATUSES}
+    orders_by_status = {}
+    revenue_by_period = {}
+    revenue = Decimal(0)
+    guest_total = guest_orders = 0
+    for row in rows:
+        if row.order_count:
+            orders_by_status[row.status] = orders_by_status.get(row.status, 0) + row.order_count
+        if row.status not in counted:
+            continue
+
+        bucket = revenue_by_period.setdefault(_period_start(row.day, period), {"revenue": Decimal(0), "orders": 0})
+        bucket["revenue"] += row.revenue
+        bucket["orders"] += row.order_count
+        revenue += row.revenue
+        guest_total += row.guest_count
+        guest_orders += row.guest_order_count
+
+    # Item popularity is bucketed by confirmation day, see app/utils/rankings.py
+    quantity = func.sum(MenuItemDailyOrders.quantity)
+    top = (
+        db.session.query(MenuItem.id, MenuItem.name, quantity, func.sum(MenuItemDailyOrders.order_count))
+        .join(MenuItemDailyOrders, MenuItemDailyOrders.menu_item_id == MenuItem.id)
+        .filter(MenuItem.caterer_id == caterer_id,
+                MenuItemDailyOrders.day >= start, MenuItemDailyOrders.day <= end)
+        .group_by(MenuItem.id, MenuItem.name)
+        .having(quantity > 0)
+        .order_by(quantity.desc(), MenuItem.id)
+        .limit(top_items)
+        .all()
+    )
+
+    return {
+        "orders_by_status": orders_by_status,
+        "total_orders": sum(orders_by_status.values()),
+        "revenue": float(revenue),
+        "revenue_by_period": [
+            {"period": day.isoformat(), "revenue": float(bucket["revenue"]), "orders": bucket["orders"]}
+            for day, bucket in sorted(revenue_by_period.items())
+        ],
+        "average_guest_count": round(guest_total / guest_orders, 1) if guest_orders else None,
+        "top_items": [
+            {"menu_item_id": menu_item_id, "name": name, "quantity": int(total), "order_count": int(order_count)}
+            for menu_item_id, name, total, order_count in top
+        ],
+    }
+
+
+def rebuild_caterer_daily_stats():
+    """Recompute caterer_daily_stats from order history (one-off backfill)"""
+    day = func.date(Order.created_at)
+    revenue = func.coalesce(Order.final_total, Order.total_amount)
+    rows = (
+        db.session.query(
+            Order.caterer_id,
+            day,
+            Order.status,
+            func.count(Order.id),
+            func.sum(revenue),
+            func.sum(func.coalesce(Order.guest_count, 0)),
+            func.count(func.nullif(Order.guest_count, 0)),
+        )
+        .filter(Order.status != OrderStatus.DRAFT, Order.status.isnot(None), Order.created_at.isnot(None))
+        .group_by(Order.caterer_id, day, Order.status)
+        .all()
+    )
+
+    db.session.execute(delete(CatererDailyStats))
+    if rows:
+        db.session.execute(insert(CatererDailyStats), [
+            {"caterer_id": caterer_id,
+             "day": bucket if not isinstance(bucket, str) else datetime.strptime(bucket, "%Y-%m-%d").date(),
+             "status": status.value, "order_count": int(order_count), "revenue": Decimal(str(total or 0)),
+             "guest_count": int(guests or 0), "guest_order_count": int(guest_orders)}
+            for caterer_id, bucket, status, order_count, total, guests, guest_orders in rows
+        ])
+    db.session.commit()
+    return len(rows)
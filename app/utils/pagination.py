@@ -0,0 +1,118 @@
+# app/utils/pagination.py
+import base64
+import binascii
+import json
+from datetime import datetime, date
+from sqlalchemy import and_, or_, tuple_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    """Raised when a continuation token cannot be decoded"""
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise ValueError("unknown cursor value")
+    return value
+
+
+def encode_cursor(values):
+    """Encode sort key values as an opaque URL-safe token"""
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token, size=None):
+    """Decode a token produced by encode_cursor, raises InvalidCursor"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = [_decode_value(value) for value in json.loads(base64.urlsafe_b64decode(padded))]
+    except (ValueError, TypeError, binascii.Error):
+        raise InvalidCursor("Invalid cursor")
+
+    if size is not None and len(values) != size:
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Clamp a page size query parameter"""
+    try:
+        limit = int(value) if value is not None else default
+    except (TypeError, ValueError):
+        limit = default
+    return max(1, min(limit, maximum))
+
+
+def keyset_filter(columns, values):
+    """
+    Rows strictly after `values` in the ordering given by `columns`,
+    a list of (column, descending) pairs.
+    """
+    directions = {descending for _, descending in columns}
+    if len(directions) == 1:
+        # Same direction everywhere: a row value comparison the planner can serve from one index
+        left = tuple_(*[column for column, _ in columns])
+        right = tuple_(*values)
+        return left < right if directions.pop() else left > right
+
+    clauses = []
+    for i, (column, descending) in enumerate(columns):
+        equal_prefix = [columns[j][0] == values[j] for j in range(i)]
+        step = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal_prefix, step))
+    return or_(*clauses)
+
+
+def paginate_keyset(query, columns, key, limit, cursor=None):
+    """
+    Fetch one page of `query` ordered by `columns` ((column, descending) pairs).
+    `key` extracts the sort values from a result row.
+    Returns (rows, next_cursor), next_cursor is None on the last page.
+    """
+    if cursor:
+        query = query.filter(keyset_filter(columns, decode_cursor(cursor, size=len(columns))))
+
+    query = query.order_by(*[column.desc() if descending else column.asc() for column, descending in columns])
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(key(rows[-1]))
+    return rows, next_cursor
+
+
+def estimated_count(query):
+    """
+    The planner's row estimate for `query` without running it (Postgres),
+    None on databases that can't estimate. Constant time, but only as
+    accurate as the table statistics.
+    """
+    session = query.session
+    bind = session.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+
+    sql = str(query.statement.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True}))
+    if bind.dialect.paramstyle in ("format", "pyformat"):
+        sql = sql.replace("%", "%%")
+    plan = session.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}", {}).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,134 @@
+# app/utils/pricing.py
+from decimal import Decimal
+
+from app.extensions import db, cache
+from app.models import MenuItem
+from app.utils.cache import PRICE_TABLES
+
+
+class PricingError(ValueError):
+    """An order line that can't be priced, carries the HTTP status to answer with"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def load_price_table(caterer_id, menu_item_ids):
+    """
+    {menu_item_id: (price, is_active, name)} for the caterer's items among
+    `menu_item_ids`, in one IN (...) query. Prices are Decimals.
+    """
+    menu_item_ids = set(menu_item_ids)
+    if not menu_item_ids:
+        return {}
+
+    rows = (
+        db.session.query(MenuItem.id, MenuItem.price, MenuItem.is_active, MenuItem.name)
+        .filter(MenuItem.caterer_id == caterer_id, MenuItem.id.in_(menu_item_ids))
+        .all()
+    )
+    return {menu_item_id: (Decimal(price), is_active, name) for menu_item_id, price, is_active, name in rows}
+
+
+def get_price_table(caterer_id):
+    """
+    The caterer's whole price table, from the PRICE_TABLES cache namespace
+    keyed by the catalogue version so any menu change (which bumps it)
+    invalidates it. Only cached when the workers share versions, otherwise
+    a worker that missed the bump would keep quoting old prices.
+    Shared by all callers, treat the returned dict as read-only.
+    """
+    caterer_id = _parse_id(caterer_id)
+    if caterer_id is None:
+        return {}
+
+    shared = cache.shares_versions
+    key = f"{cache.get_version()}:{caterer_id}" if shared else None
+    table = cache.namespace(PRICE_TABLES).get(key) if shared else None
+    if table is None:
+        rows = (
+            db.session.query(MenuItem.id, MenuItem.price, MenuItem.is_active, MenuItem.name)
+            .filter(MenuItem.caterer_id == caterer_id)
+            .all()
+        )
+        table = {menu_item_id: (Decimal(price), is_active, name) for menu_item_id, price, is_active, name in rows}
+        if shared:
+            cache.namespace(PRICE_TABLES).set(key, table)
+    return table
+
+
+def _parse_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_quantity(value):
+    """Quantity as a positive int, raises PricingError"""
+    if isinstance(value, bool):
+        raise PricingError('Quantity must be a positive whole number')
+    try:
+        quantity = int(value)
+    except (TypeError, ValueError):
+        raise PricingError('Quantity must be a positive whole number')
+    if quantity < 1 or quantity != Decimal(str(value)):
+        raise PricingError('Quantity must be a positive whole number')
+    return quantity
+
+
+def price_order_items(caterer_id, items, strict=True, price_table=None):
+    """
+    Validate and price order lines against the caterer's menu.
+    Returns (lines, total): each line has menu_item_id, name, quantity,
+    unit_price, line_total and the original `item` dict; amounts are Decimals.
+
+    strict (create_order): the first malformed, unknown or unavailable line raises PricingError.
+    lenient (quotes): such lines are skipped.
+    `price_table` defaults to load_price_table for the requested ids.
+    """
+    if not isinstance(items, list):
+        raise PricingError('order_items must be a list')
+
+    if price_table is None:
+        price_table = load_price_table(caterer_id, {
+            _parse_id(item.get('menu_item_id')) for item in items if isinstance(item, dict)
+        } - {None})
+
+    lines = []
+    total = Decimal('0.00')
+
+    for item in items:
+        try:
+            if not isinstance(item, dict) or 'menu_item_id' not in item or 'quantity' not in item:
+                raise PricingError('Each order item must have menu_item_id and quantity')
+
+            menu_item_id = _parse_id(item['menu_item_id'])
+            entry = price_table.get(menu_item_id)
+            if entry is None:
+                raise PricingError(f'Menu item not found for this caterer: {item["menu_item_id"]}', 404)
+
+            unit_price, is_active, name = entry
+            if not is_active:
+                raise PricingError(f'Menu item not available: {name}')
+
+            quantity = parse_quantity(item['quantity'])
+        except PricingError:
+            if strict:
+                raise
+            continue
+
+        line_total = unit_price * quantity
+        total += line_total
+        lines.append({
+            'menu_item_id': menu_item_id,
+            'name': name,
+            'quantity': quantity,
+            'unit_price': unit_price,
+            'line_total': line_total,
+            'item': item,
+        })
+
+    return lines, total
+
@@ -0,0 +1,215 @@
+# app/utils/query_plans.py
+import json
+import random
+import re
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.extensions import db
+from app.models import CatererProfile, MenuItem, Order, OrderItem, OrderStatus, User, UserRole
+from app.utils.pagination import keyset_filter
+
+SEED_BATCH_SIZE = 5000
+MENU_ITEMS_PER_CATERER = 20
+ITEMS_PER_ORDER = 3
+
+# Tables the hot queries must reach through an index
+HOT_TABLES = ('orders', 'order_items')
+
+# Finished orders dominate a real orders table (carts live in the cart store)
+ORDER_STATUS_WEIGHTS = {
+    OrderStatus.COMPLETED: 40,
+    OrderStatus.DELIVERED: 30,
+    OrderStatus.CANCELLED: 10,
+    OrderStatus.CONFIRMED: 8,
+    OrderStatus.PENDING: 12,
+}
+
+# Query name -> statement builder taking the sample ids, mirroring the order endpoints
+HOT_QUERIES = {
+    'client order list': lambda ids: (
+        select(Order.id).where(Order.client_id == ids['client_id'])
+        .order_by(Order.created_at.desc(), Order.id.desc()).limit(10)
+    ),
+    'client order list by status': lambda ids: (
+        select(Order.id).where(Order.client_id == ids['client_id'], Order.status == OrderStatus.COMPLETED)
+        .order_by(Order.created_at.desc(), Order.id.desc()).limit(10)
+    ),
+    'caterer order list': lambda ids: (
+        select(Order.id).where(Order.caterer_id == ids['caterer_id'])
+        .order_by(Order.created_at.desc(), Order.id.desc()).limit(10)
+    ),
+    'caterer order list by status': lambda ids: (
+        select(Order.id).where(Order.caterer_id == ids['caterer_id'], Order.status == OrderStatus.PENDING)
+        .order_by(Order.created_at.desc(), Order.id.desc()).limit(10)
+    ),
+    'admin order list': lambda ids: (
+        select(Order.id).order_by(Order.created_at.desc(), Order.id.desc()).limit(10)
+    ),
+    'admin order list by status': lambda ids: (
+        select(Order.id).where(Order.status == OrderStatus.PENDING)
+        .order_by(Order.created_at.desc(), Order.id.desc()).limit(10)
+    ),
+    'admin order list next page': lambda ids: (
+        select(Order.id)
+        .where(keyset_filter([(Order.created_at, True), (Order.id, True)], (ids['order_created_at'], ids['order_id'])))
+        .order_by(Order.created_at.desc(), Order.id.desc()).limit(10)
+    ),
+    'order items': lambda ids: (
+        select(OrderItem.id, OrderItem.menu_item_id, OrderItem.quantity).where(OrderItem.order_id == ids['order_id'])
+    ),
+    'menu item order lines': lambda ids: (
+        select(OrderItem.id).where(OrderItem.menu_item_id == ids['menu_item_id']).limit(1)
+    ),
+}
+
+
+def _next_id(conn, model):
+    return (conn.scalar(select(func.max(model.id))) or 0) + 1
+
+
+def _insert(conn, model, rows):
+    for start in range(0, len(rows), SEED_BATCH_SIZE):
+        conn.execute(model.__table__.insert(), rows[start:start + SEED_BATCH_SIZE])
+
+
+def seed_orders(conn, orders=200000, clients=5000, caterers=200, seed=0):
+    """
+    Insert a synthetic order history on `conn`: users, caterers with menus,
+    orders spread over a year and their items. Returns the ids the hot queries sample.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    first_user = _next_id(conn, User)
+    _insert(conn, User, [
+        {'id': first_user + n, 'email': f'bench-{first_user + n}@example.invalid', 'password_hash': '!',
+         'role': UserRole.CATERER if n < caterers else UserRole.CLIENT}
+        for n in range(caterers + clients)
+    ])
+    client_ids = list(range(first_user + caterers, first_user + caterers + clients))
+
+    first_caterer = _next_id(conn, CatererProfile)
+    caterer_ids = list(range(first_caterer, first_caterer + caterers))
+    _insert(conn, CatererProfile, [
+        {'id': caterer_id, 'user_id': first_user + n, 'business_name': f'Bench Caterer {caterer_id}'}
+        for n, caterer_id in enumerate(caterer_ids)
+    ])
+
+    first_menu_item = _next_id(conn, MenuItem)
+    menus = {
+        caterer_id: list(range(first_menu_item + n * MENU_ITEMS_PER_CATERER,
+                               first_menu_item + (n + 1) * MENU_ITEMS_PER_CATERER))
+        for n, caterer_id in enumerate(caterer_ids)
+    }
+    _insert(conn, MenuItem, [
+        {'id': menu_item_id, 'caterer_id': caterer_id, 'name': f'Bench Item {menu_item_id}', 'price': 10}
+        for caterer_id, menu_item_ids in menus.items() for menu_item_id in menu_item_ids
+    ])
+
+    statuses = list(ORDER_STATUS_WEIGHTS)
+    weights = list(ORDER_STATUS_WEIGHTS.values())
+    first_order = _next_id(conn, Order)
+    first_order_item = _next_id(conn, OrderItem)
+    order_rows, item_rows = [], []
+    for order_id in range(first_order, first_order + orders):
+        client_id = rng.choice(client_ids)
+        caterer_id = rng.choice(caterer_ids)
+        status = rng.choices(statuses, weights)[0]
+
+        order_rows.append({
+            'id': order_id, 'order_number': f'BENCH{order_id}', 'client_id': client_id,
+            'caterer_id': caterer_id, 'status': status, 'total_amount': 30,
+            'created_at': now - timedelta(minutes=rng.randrange(365 * 24 * 60)),
+        })
+        for menu_item_id in rng.sample(menus[caterer_id], ITEMS_PER_ORDER):
+            item_rows.append({'id': first_order_item + len(item_rows), 'order_id': order_id,
+                              'menu_item_id': menu_item_id, 'quantity': 1, 'unit_price': 10})
+
+        if len(order_rows) >= SEED_BATCH_SIZE:
+            _insert(conn, Order, order_rows)
+            _insert(conn, OrderItem, item_rows)
+            first_order_item += len(item_rows)
+            order_rows, item_rows = [], []
+
+    _insert(conn, Order, order_rows)
+    _insert(conn, OrderItem, item_rows)
+
+    sample_order = first_order + orders // 2
+    return {
+        'client_id': client_ids[0],
+        'caterer_id': caterer_ids[0],
+        'order_id': sample_order,
+        'order_created_at': conn.scalar(select(Order.created_at).where(Order.id == sample_order)),
+        'menu_item_id': conn.scalar(select(OrderItem.menu_item_id).where(OrderItem.order_id == sample_order).limit(1)),
+    }
+
+
+def _postgresql_scans(conn, sql):
+    plan = conn.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {sql}').scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    scans, nodes = [], [plan[0]['Plan']]
+    while nodes:
+        node = nodes.pop()
+        if node['Node Type'] == 'Seq Scan' and node.get('Relation Name') in HOT_TABLES:
+            scans.append(node['Relation Name'])
+        nodes.extend(node.get('Plans', []))
+    return scans, json.dumps(plan, indent=2)
+
+
+def _sqlite_scans(conn, sql):
+    # "SCAN orders" reads the whole table, "SEARCH orders USING INDEX ..." doesn't and neither
+    # does "SCAN orders USING INDEX ..." (an index walk in ORDER BY order, stopped by the LIMIT)
+    # unless the rows still go through "USE TEMP B-TREE FOR ORDER BY", i.e. all of them are sorted
+    details = [row[-1] for row in conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}')]
+    reads = [
+        (match.group(1), match.group(2), bool(match.group(3)))
+        for match in (re.match(r'(SCAN|SEARCH) (?:TABLE )?(\w+)( USING)?', detail) for detail in details)
+        if match and match.group(2) in HOT_TABLES
+    ]
+    sorted_in_memory = any(detail.startswith('USE TEMP B-TREE FOR ORDER BY') for detail in details)
+    scans = [
+        table for op, table, uses_index in reads
+        if (op == 'SCAN' and not uses_index) or sorted_in_memory
+    ]
+    return scans, '\n'.join(details)
+
+
+def explain_hot_queries(conn, ids):
+    """
+    EXPLAIN every hot query against the data on `conn`.
+    Returns [(name, tables read with a full scan, plan text)].
+    """
+    dialect = conn.dialect.name
+    if dialect == 'postgresql':
+        conn.exec_driver_sql(f'ANALYZE {", ".join(HOT_TABLES)}')
+        explain = _postgresql_scans
+    elif dialect == 'sqlite':
+        conn.exec_driver_sql('ANALYZE')
+        explain = _sqlite_scans
+    else:
+        raise ValueError(f'Query plans are not supported on {dialect}')
+
+    results = []
+    for name, build_query in HOT_QUERIES.items():
+        sql = str(build_query(ids).compile(dialect=conn.dialect, compile_kwargs={'literal_binds': True}))
+        scans, plan = explain(conn, sql)
+        results.append((name, scans, plan))
+    return results
+
+
+def check_query_plans(orders=200000, clients=5000, caterers=200):
+    """
+    Seed a large order history, EXPLAIN the hot order queries and roll
+    everything back (planner statistics included on Postgres), leaving the database as it was.
+    """
+    with db.engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            ids = seed_orders(conn, orders=orders, clients=clients, caterers=caterers)
+            return explain_hot_queries(conn, ids)
+        finally:
+            transaction.rollback()
@@ -0,0 +1,139 @@
+# app/utils/rankings.py
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models import MenuItem, MenuItemDailyOrders, MenuItemRanking, Order, OrderItem, OrderStatus
+from app.utils.rollups import increment_counters
+
+# Orders in these statuses count towards popularity
+COUNTED_ORDER_STATUSES = {
+    OrderStatus.CONFIRMED,
+    OrderStatus.PREPARING,
+    OrderStatus.OUT_FOR_DELIVERY,
+    OrderStatus.COMPLETED,
+    OrderStatus.DELIVERED,
+}
+
+# Ranking kind -> (config key for the window in days, daily counter it sums)
+RANKING_KINDS = {
+    "trending": ("TRENDING_WINDOW_DAYS", MenuItemDailyOrders.quantity),
+    "recommended": ("RECOMMENDED_WINDOW_DAYS", MenuItemDailyOrders.order_count),
+}
+
+
+def record_order_status_change(order, old_status):
+    """
+    Add the order's items to (or remove them from) the daily buckets when it
+    enters or leaves the counted statuses. Only touches the rows for this
+    order's items, in the caller's transaction. Returns True if anything changed.
+    """
+    was_counted = old_status in COUNTED_ORDER_STATUSES
+    is_counted = order.status in COUNTED_ORDER_STATUSES
+    if was_counted == is_counted or not order.confirmed_at:
+        return False
+
+    sign = 1 if is_counted else -1
+    day = order.confirmed_at.date()
+    quantities = (
+        db.session.query(OrderItem.menu_item_id, func.sum(OrderItem.quantity))
+        .filter(OrderItem.order_id == order.id)
+        .group_by(OrderItem.menu_item_id)
+        .all()
+    )
+
+    increment_counters(MenuItemDailyOrders, ["menu_item_id", "day"], [
+        {"menu_item_id": menu_item_id, "day": day, "quantity": sign * (quantity or 0), "order_count": sign}
+        for menu_item_id, quantity in quantities
+    ])
+    return bool(quantities)
+
+
+def refresh_menu_rankings():
+    """Rebuild every ranked list from the sliding windows over the daily buckets"""
+    from app.utils.cache import bump_catalogue_version
+
+    size = current_app.config.get('MENU_RANKING_SIZE', 50)
+    today = datetime.utcnow().date()
+    now = datetime.utcnow()
+
+    try:
+        for kind, (window_key, counter) in RANKING_KINDS.items():
+            since = today - timedelta(days=current_app.config.get(window_key, 7) - 1)
+            score = func.sum(counter)
+            top = (
+                db.session.query(MenuItemDailyOrders.menu_item_id, score)
+                .join(MenuItem, MenuItem.id == MenuItemDailyOrders.menu_item_id)
+                .filter(MenuItemDailyOrders.day >= since, MenuItem.is_active.is_(True))
+                .group_by(MenuItemDailyOrders.menu_item_id)
+                .having(score > 0)
+                .order_by(score.desc(), MenuItemDailyOrders.menu_item_id)
+                .limit(size)
+                .all()
+            )
+
+            db.session.execute(delete(MenuItemRanking).where(MenuItemRanking.kind == kind))
+            if top:
+                db.session.execute(insert(MenuItemRanking), [
+                    {"kind": kind, "rank": rank, "menu_item_id": menu_item_id,
+                     "score": int(total), "computed_at": now}
+                    for rank, (menu_item_id, total) in enumerate(top, start=1)
+                ])
+        db.session.commit()
+    except IntegrityError:
+        # Another worker refreshed at the same time, its result is just as good
+        db.session.rollback()
+        return False
+
+    bump_catalogue_version()
+    return True
+
+
+def refresh_menu_rankings_if_stale():
+    """Refresh when the ranked lists are older than MENU_RANKING_MAX_AGE seconds"""
+    max_age = current_app.config.get('MENU_RANKING_MAX_AGE', 900)
+    computed_at = db.session.query(func.min(MenuItemRanking.computed_at)).scalar()
+    if computed_at and datetime.utcnow() - computed_at < timedelta(seconds=max_age):
+        return False
+    return refresh_menu_rankings()
+
+
+def ranked_kinds():
+    """Kinds that currently have a precomputed list"""
+    return {kind for (kind,) in db.session.query(MenuItemRanking.kind).distinct()}
+
+
+def ranked_item_ids(kind):
+    """Subquery of the menu item ids in one ranked list"""
+    return select(MenuItemRanking.menu_item_id).where(MenuItemRanking.kind == kind)
+
+
+def rebuild_daily_orders():
+    """Recompute the daily buckets from order history (one-off backfill)"""
+    day = func.date(Order.confirmed_at)
+    rows = (
+        db.session.query(
+            OrderItem.menu_item_id,
+            day,
+            func.sum(OrderItem.quantity),
+            func.count(func.distinct(Order.id)),
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .filter(Order.status.in_(COUNTED_ORDER_STATUSES), Order.confirmed_at.isnot(None))
+        .group_by(OrderItem.menu_item_id, day)
+        .all()
+    )
+
+    db.session.execute(delete(MenuItemDailyOrders))
+    if rows:
+        db.session.execute(insert(MenuItemDailyOrders), [
+            {"menu_item_id": menu_item_id,
+             "day": bucket if not isinstance(bucket, str) else datetime.strptime(bucket, "%Y-%m-%d").date(),
+             "quantity": int(quantity or 0), "order_count": int(order_count)}
+            for menu_item_id, bucket, quantity, order_count in rows
+        ])
+    db.session.commit()
+    return len(rows)
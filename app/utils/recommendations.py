@@ -0,0 +1,133 @@
+# app/utils/recommendations.py
+from flask import current_app
+from sqlalchemy import delete, func, insert, select, text
+
+from app.extensions import db, cache
+from app.models import MenuItem, MenuItemNeighbour, MenuItemPairCount, OrderItem, OrderStatus
+from app.utils.rollups import increment_counters
+
+# Orders in these statuses feed the co-occurrence counts
+COMPLETED_ORDER_STATUSES = {OrderStatus.COMPLETED, OrderStatus.DELIVERED}
+
+# Cache version of the neighbour lists, part of the cart ETag
+SUGGESTIONS_VERSION = "suggestions"
+
+NEIGHBOUR_REFRESH_BATCH_SIZE = 500
+
+_PAIR_COUNTS_REBUILD = """
+    INSERT INTO menu_item_pair_counts (menu_item_id, other_item_id, count)
+    SELECT a.menu_item_id, b.menu_item_id, COUNT(DISTINCT a.order_id)
+    FROM order_items a
+    JOIN order_items b ON b.order_id = a.order_id AND b.menu_item_id <> a.menu_item_id
+    JOIN orders o ON o.id = a.order_id
+    WHERE o.status IN :statuses
+    GROUP BY a.menu_item_id, b.menu_item_id
+"""
+
+
+def refresh_item_neighbours(item_ids):
+    """Recompute the top-K neighbour rows of the given items from their pair counts"""
+    item_ids = list(item_ids)
+    if not item_ids:
+        return
+
+    k = current_app.config.get('CART_SUGGESTION_NEIGHBOURS', 20)
+    position = func.row_number().over(
+        partition_by=MenuItemPairCount.menu_item_id,
+        order_by=(MenuItemPairCount.count.desc(), MenuItemPairCount.other_item_id)
+    ).label("position")
+    ranked = (
+        select(MenuItemPairCount.menu_item_id, MenuItemPairCount.other_item_id, MenuItemPairCount.count, position)
+        .where(MenuItemPairCount.menu_item_id.in_(item_ids), MenuItemPairCount.count > 0)
+        .subquery()
+    )
+    rows = db.session.execute(select(ranked).where(ranked.c.position <= k)).all()
+
+    db.session.execute(delete(MenuItemNeighbour).where(MenuItemNeighbour.menu_item_id.in_(item_ids)))
+    if rows:
+        db.session.execute(insert(MenuItemNeighbour), [
+            {"menu_item_id": menu_item_id, "rank": rank, "neighbour_id": other_item_id, "score": count}
+            for menu_item_id, other_item_id, count, rank in rows
+        ])
+
+
+def record_order_completion(order, old_status):
+    """
+    Count every pair of items in the order when it completes (or uncount them
+    when it leaves the completed statuses), then refresh the neighbour lists of
+    those items only. Runs in the caller's transaction, returns True on changes.
+    """
+    was_completed = old_status in COMPLETED_ORDER_STATUSES
+    is_completed = order.status in COMPLETED_ORDER_STATUSES
+    if was_completed == is_completed:
+        return False
+
+    item_ids = [
+        menu_item_id for (menu_item_id,) in
+        db.session.query(OrderItem.menu_item_id).filter(OrderItem.order_id == order.id).distinct()
+    ]
+    if len(item_ids) < 2:
+        return False
+
+    sign = 1 if is_completed else -1
+    increment_counters(MenuItemPairCount, ["menu_item_id", "other_item_id"], [
+        {"menu_item_id": a, "other_item_id": b, "count": sign}
+        for a in item_ids for b in item_ids if a != b
+    ])
+    refresh_item_neighbours(item_ids)
+    return True
+
+
+def bump_suggestions_version():
+    """Invalidate cart ETags once new neighbour lists are committed"""
+    cache.bump_version(SUGGESTIONS_VERSION)
+
+
+def rebuild_item_neighbours():
+    """Recount all pairs from completed orders and rebuild every neighbour list"""
+    db.session.execute(delete(MenuItemNeighbour))
+    db.session.execute(delete(MenuItemPairCount))
+    db.session.execute(
+        text(_PAIR_COUNTS_REBUILD).bindparams(db.bindparam("statuses", expanding=True)),
+        {"statuses": [status.name for status in COMPLETED_ORDER_STATUSES]}
+    )
+
+    item_ids = [
+        menu_item_id for (menu_item_id,) in
+        db.session.query(MenuItemPairCount.menu_item_id).distinct().order_by(MenuItemPairCount.menu_item_id)
+    ]
+    for start in range(0, len(item_ids), NEIGHBOUR_REFRESH_BATCH_SIZE):
+        refresh_item_neighbours(item_ids[start:start + NEIGHBOUR_REFRESH_BATCH_SIZE])
+
+    db.session.commit()
+    bump_suggestions_version()
+    return len(item_ids)
+
+
+def suggest_menu_items(item_ids, limit=None, fields=None):
+    """
+    Items most often ordered together with `item_ids`, best first.
+    A single query over the neighbour lists of the given items,
+    returns (menu_item, score) pairs.
+    """
+    item_ids = list(item_ids)
+    if not item_ids:
+        return []
+    limit = limit or current_app.config.get('CART_SUGGESTION_LIMIT', 5)
+
+    scores = (
+        select(MenuItemNeighbour.neighbour_id, func.sum(MenuItemNeighbour.score).label("score"))
+        .where(MenuItemNeighbour.menu_item_id.in_(item_ids), MenuItemNeighbour.neighbour_id.not_in(item_ids))
+        .group_by(MenuItemNeighbour.neighbour_id)
+        .subquery()
+    )
+    rows = (
+        MenuItem.serializable_query(fields)
+        .join(scores, scores.c.neighbour_id == MenuItem.id)
+        .filter(MenuItem.is_active.is_(True))
+        .add_columns(scores.c.score)
+        .order_by(scores.c.score.desc(), MenuItem.id)
+        .limit(limit)
+        .all()
+    )
+    return [(row.MenuItem, int(row.score)) for row in rows]
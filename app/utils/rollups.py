@@ -0,0 +1,45 @@
+# app/utils/rollups.py
+from app.extensions import db
+
+
+def _dialect_name():
+    return db.session.get_bind().dialect.name
+
+
+def increment_counters(model, key_columns, rows):
+    """
+    Add to counter columns of a rollup table, creating missing rows.
+    `rows` are dicts holding the key columns and the amounts to add,
+    e.g. {"menu_item_id": 1, "day": date, "quantity": 3}. Negative amounts subtract.
+    Runs in the caller's transaction as a single upsert statement.
+    """
+    if not rows:
+        return
+
+    table = model.__table__
+    counter_columns = [column for column in rows[0] if column not in key_columns]
+    dialect = _dialect_name()
+
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={column: table.c[column] + stmt.excluded[column] for column in counter_columns}
+        )
+        db.session.execute(stmt, rows)
+        return
+
+    # Other databases: update, then insert the rows that didn't exist yet
+    for row in rows:
+        result = db.session.execute(
+            table.update()
+            .where(*[table.c[column] == row[column] for column in key_columns])
+            .values({column: table.c[column] + row[column] for column in counter_columns})
+        )
+        if not result.rowcount:
+            db.session.execute(table.insert(), row)
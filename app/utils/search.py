@@ -0,0 +1,139 @@
+# app/utils/search.py
+import re
+import sqlalchemy as sa
+from sqlalchemy import text, bindparam, func, literal_column
+from app.extensions import db
+from app.models import MenuItem
+
+# PostgreSQL: shadow table holding a weighted tsvector per menu item (GIN indexed)
+PG_SEARCH_TABLE = "menu_item_search"
+# SQLite: FTS5 virtual table whose rowid is the menu item id
+SQLITE_FTS_TABLE = "menu_items_fts"
+
+MAX_SEARCH_TOKENS = 10
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_pg_search = sa.table(
+    PG_SEARCH_TABLE,
+    sa.column("menu_item_id"),
+    sa.column("document"),
+)
+_sqlite_fts = sa.table(
+    SQLITE_FTS_TABLE,
+    sa.column("rowid"),
+)
+
+# Name weighs most, then the caterer's business name, then the description
+_PG_DOCUMENT_SELECT = """
+    SELECT m.id,
+           setweight(to_tsvector('simple', coalesce(m.name, '')), 'A') ||
+           setweight(to_tsvector('simple', coalesce(c.business_name, '')), 'B') ||
+           setweight(to_tsvector('simple', coalesce(m.description, '')), 'C')
+    FROM menu_items m
+    LEFT JOIN caterer_profiles c ON c.id = m.caterer_id
+"""
+
+_SQLITE_DOCUMENT_SELECT = """
+    SELECT m.id, coalesce(m.name, ''), coalesce(m.description, ''), coalesce(c.business_name, '')
+    FROM menu_items m
+    LEFT JOIN caterer_profiles c ON c.id = m.caterer_id
+"""
+
+
+def _dialect_name():
+    return db.session.get_bind().dialect.name
+
+
+def tokenize_search(search):
+    """Split a raw search string into lowercase word tokens"""
+    return [token.lower() for token in _TOKEN_RE.findall(search or '')][:MAX_SEARCH_TOKENS]
+
+
+def index_menu_items(item_ids):
+    """
+    Rebuild the search document for the given menu items.
+    Ids that no longer exist in menu_items are simply dropped from the index,
+    so this covers create, update and delete. Runs in the caller's transaction.
+    """
+    item_ids = [int(item_id) for item_id in item_ids if item_id is not None]
+    if not item_ids:
+        return
+
+    dialect = _dialect_name()
+    if dialect == 'postgresql':
+        db.session.execute(
+            text(f"DELETE FROM {PG_SEARCH_TABLE} WHERE menu_item_id IN :ids")
+            .bindparams(bindparam("ids", expanding=True)),
+            {"ids": item_ids}
+        )
+        db.session.execute(
+            text(f"INSERT INTO {PG_SEARCH_TABLE} (menu_item_id, document) "
+                 f"{_PG_DOCUMENT_SELECT} WHERE m.id IN :ids")
+            .bindparams(bindparam("ids", expanding=True)),
+            {"ids": item_ids}
+        )
+    elif dialect == 'sqlite':
+        db.session.execute(
+            text(f"DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid IN :ids")
+            .bindparams(bindparam("ids", expanding=True)),
+            {"ids": item_ids}
+        )
+        db.session.execute(
+            text(f"INSERT INTO {SQLITE_FTS_TABLE} (rowid, name, description, business_name) "
+                 f"{_SQLITE_DOCUMENT_SELECT} WHERE m.id IN :ids")
+            .bindparams(bindparam("ids", expanding=True)),
+            {"ids": item_ids}
+        )
+
+
+def rebuild_search_index():
+    """Drop and rebuild the whole search index from menu_items"""
+    dialect = _dialect_name()
+    if dialect == 'postgresql':
+        db.session.execute(text(f"DELETE FROM {PG_SEARCH_TABLE}"))
+        db.session.execute(text(f"INSERT INTO {PG_SEARCH_TABLE} (menu_item_id, document) {_PG_DOCUMENT_SELECT}"))
+    elif dialect == 'sqlite':
+        db.session.execute(text(f"DELETE FROM {SQLITE_FTS_TABLE}"))
+        db.session.execute(text(
+            f"INSERT INTO {SQLITE_FTS_TABLE} (rowid, name, description, business_name) {_SQLITE_DOCUMENT_SELECT}"
+        ))
+    else:
+        return 0
+    db.session.commit()
+    return db.session.query(func.count(MenuItem.id)).scalar()
+
+
+def apply_search(query, search):
+    """
+    Restrict a MenuItem query to full-text matches of `search`.
+    Every token is prefix matched and all tokens must match.
+    Returns (query, rank) where rank is a "higher is better" SQL expression,
+    or None when the search string has no usable tokens.
+    """
+    tokens = tokenize_search(search)
+    if not tokens:
+        return query, None
+
+    dialect = _dialect_name()
+    if dialect == 'postgresql':
+        ts_query = func.to_tsquery('simple', " & ".join(f"{token}:*" for token in tokens))
+        query = query.join(_pg_search, _pg_search.c.menu_item_id == MenuItem.id).filter(
+            _pg_search.c.document.op('@@')(ts_query)
+        )
+        return query, func.ts_rank_cd(_pg_search.c.document, ts_query)
+
+    if dialect == 'sqlite':
+        fts = literal_column(SQLITE_FTS_TABLE)
+        match = " ".join(f'"{token}"*' for token in tokens)
+        query = query.join(_sqlite_fts, _sqlite_fts.c.rowid == MenuItem.id).filter(fts.op('MATCH')(match))
+        # bm25() is "lower is better"; weights follow the column order name, description, business_name
+        return query, -func.bm25(fts, 10.0, 2.0, 5.0)
+
+    # Other databases: fall back to substring matching without ranking
+    for token in tokens:
+        query = query.filter(
+            (MenuItem.name.ilike(f"%{token}%")) |
+            (MenuItem.description.ilike(f"%{token}%"))
+        )
+    return query, None
@@ -0,0 +1,83 @@
+# app/utils/upload_gc.py
+import os
+import time
+
+from flask import current_app
+
+from app.utils.image_processing import UPLOAD_URL_PREFIX
+
+REFERENCE_BATCH_SIZE = 5000
+
+
+def _stem(filename):
+    """Key shared by an upload and its variants: abc.jpg, abc_thumbnail.webp -> abc"""
+    return filename.rsplit('.', 1)[0].split('_', 1)[0]
+
+
+def referenced_upload_stems():
+    """Stems of every upload referenced by a menu item, streamed from one column query"""
+    from app.extensions import db
+    from app.models import MenuItem
+
+    rows = (
+        db.session.query(MenuItem.image_url)
+        .filter(MenuItem.image_url.startswith(UPLOAD_URL_PREFIX))
+        .distinct()
+        .execution_options(yield_per=REFERENCE_BATCH_SIZE)
+    )
+    return {_stem(os.path.basename(image_url)) for (image_url,) in rows}
+
+
+def _delete_batch(paths, stats):
+    for path in paths:
+        try:
+            os.remove(path)
+            stats['deleted'] += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            current_app.logger.error(f'Error deleting orphaned upload {path}: {str(e)}')
+
+
+def collect_upload_garbage(grace_hours=24, dry_run=False, batch_size=500):
+    """
+    Delete files in UPLOAD_FOLDER that no menu item references (including
+    their variants and leftover temp files) once they are older than the grace
+    period, which protects uploads whose menu item isn't committed yet.
+    This is the only place upload files are deleted: requests never remove them,
+    since an upload reusing the same content may be in flight.
+    The directory is streamed with os.scandir, only the referenced stems are held in memory.
+    """
+    upload_dir = os.path.abspath(current_app.config.get('UPLOAD_FOLDER', 'app/static/uploads/menu_items'))
+    stats = {'scanned': 0, 'orphaned': 0, 'deleted': 0, 'freed_bytes': 0}
+    if not os.path.isdir(upload_dir):
+        return stats
+
+    referenced = referenced_upload_stems()
+    cutoff = time.time() - grace_hours * 3600
+    batch = []
+
+    with os.scandir(upload_dir) as entries:
+        for entry in entries:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            stats['scanned'] += 1
+
+            if _stem(entry.name) in referenced:
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            if stat.st_mtime > cutoff:
+                continue
+
+            stats['orphaned'] += 1
+            stats['freed_bytes'] += stat.st_size
+            if dry_run:
+                continue
+
+            batch.append(entry.path)
+            if len(batch) >= batch_size:
+                _delete_batch(batch, stats)
+                batch = []
+
+    _delete_batch(batch, stats)
+    return stats
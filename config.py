@@ -38,6 +38,49 @@ class Config:
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 
+    # Resized WebP variants of uploaded menu images, longest edge in px
+    # IMAGE_PROCESSING_MODE: "process" (pool of worker processes), "thread" or "sync" (inline)
+    IMAGE_VARIANT_SIZES = {'thumbnail': 200, 'medium': 600, 'large': 1200}
+    IMAGE_VARIANT_QUALITY = 80
+    IMAGE_PROCESSING_MODE = os.environ.get('IMAGE_PROCESSING_MODE', 'process')
+    IMAGE_PROCESSING_WORKERS = int(os.environ.get('IMAGE_PROCESSING_WORKERS', 2))
+
+    # Who streams uploaded images: "" (the Flask worker), "x-accel-redirect" (nginx)
+    # or "x-sendfile" (Apache/lighttpd), see app/utils/media.py
+    MEDIA_OFFLOAD = os.environ.get('MEDIA_OFFLOAD', '')
+    MEDIA_ACCEL_REDIRECT_PREFIX = os.environ.get('MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+    UPLOAD_GC_GRACE_HOURS = float(os.environ.get('UPLOAD_GC_GRACE_HOURS', 24))  # flask uploads gc
+
+    # Trending/recommended lists ranked from confirmed orders (see app/utils/rankings.py)
+    TRENDING_WINDOW_DAYS = 7  # ranked by quantity ordered
+    RECOMMENDED_WINDOW_DAYS = 90  # ranked by number of orders
+    MENU_RANKING_SIZE = 50
+    MENU_RANKING_MAX_AGE = 900  # seconds, refreshed on order confirmations or `flask rankings refresh`
+
+    # "Frequently ordered together" cart suggestions (see app/utils/recommendations.py)
+    CART_SUGGESTION_NEIGHBOURS = 20  # neighbours kept per menu item
+    CART_SUGGESTION_LIMIT = 5
+
+    # Carts live outside the orders tables until checkout: "sqlite" (a file shared by the
+    # workers on one host), "redis" (needs the redis package) or "memory" (single process)
+    CART_STORE_BACKEND = os.environ.get("CART_STORE_BACKEND", "sqlite")
+    CART_STORE_PATH = os.environ.get("CART_STORE_PATH", "instance/carts.sqlite3")
+    CART_STORE_URL = os.environ.get("CART_STORE_URL", "redis://localhost:6379/0")
+    CART_TTL_DAYS = 30  # abandoned carts expire
+
+    # Response cache for the public catalogue endpoints: "memory", "file" or "null"
+    # "file" shares entries and versions between gunicorn workers; ETags built from cache
+    # versions (public catalogue, cart) are only sent with it, hence the production default
+    RESPONSE_CACHE_BACKEND = os.environ.get(
+        "RESPONSE_CACHE_BACKEND", "file" if os.environ.get("FLASK_ENV") == "production" else "memory"
+    )
+    RESPONSE_CACHE_DIR = os.environ.get("RESPONSE_CACHE_DIR", "instance/cache")
+    RESPONSE_CACHE_TTL = int(os.environ.get("RESPONSE_CACHE_TTL", 300))  # seconds
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", 2048))
+    PRICE_TABLE_CACHE_TTL = 300  # per-caterer price tables for /api/order/calculate-total
+    PRICE_TABLE_CACHE_MAX_ENTRIES = 512  # own namespace, never evicts cached responses
+    ORDER_COUNT_CACHE_TTL = 60  # order list totals (GET /api/order/?total=exact)
+
     # Google OAuth Configuration
     GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID')
     GOOGLE_CLIENT_SECRET = os.environ.get('GOOGLE_CLIENT_SECRET')
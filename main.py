@@ -1,7 +1,7 @@
 # main.py
 import os
 from app import create_app
-from flask import send_from_directory
+from app.utils.media import send_menu_item_image
 
 
 app = create_app()
@@ -9,11 +9,11 @@ app = create_app()
 
 @app.route('/static/uploads/menu_items/<filename>')
 def serve_menu_item_image(filename):
-    return send_from_directory('app/static/uploads/menu_items', filename)
+    return send_menu_item_image(filename)
 
 
 # Create upload directory if it doesn't exist
-os.makedirs('app/static/uploads/menu_items', exist_ok=True)
+os.makedirs(app.config.get('UPLOAD_FOLDER', 'app/static/uploads/menu_items'), exist_ok=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+"""Add menu item full-text search index
+
+Revision ID: 2db4e70070c2
+Revises: a22178b13b82
+Create Date: 2026-10-16 09:12:41.208311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '2db4e70070c2'
+down_revision = 'a22178b13b82'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        op.create_table('menu_item_search',
+        sa.Column('menu_item_id', sa.Integer(), nullable=False),
+        sa.Column('document', postgresql.TSVECTOR(), nullable=False),
+        sa.ForeignKeyConstraint(['menu_item_id'], ['menu_items.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('menu_item_id')
+        )
+        op.create_index('ix_menu_item_search_document', 'menu_item_search', ['document'],
+                        unique=False, postgresql_using='gin')
+        op.execute("""
+            INSERT INTO menu_item_search (menu_item_id, document)
+            SELECT m.id,
+                   setweight(to_tsvector('simple', coalesce(m.name, '')), 'A') ||
+                   setweight(to_tsvector('simple', coalesce(c.business_name, '')), 'B') ||
+                   setweight(to_tsvector('simple', coalesce(m.description, '')), 'C')
+            FROM menu_items m
+            LEFT JOIN caterer_profiles c ON c.id = m.caterer_id
+        """)
+
+    elif bind.dialect.name == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE menu_items_fts USING fts5(
+                name, description, business_name,
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '2 3'
+            )
+        """)
+        op.execute("""
+            INSERT INTO menu_items_fts (rowid, name, description, business_name)
+            SELECT m.id, coalesce(m.name, ''), coalesce(m.description, ''), coalesce(c.business_name, '')
+            FROM menu_items m
+            LEFT JOIN caterer_profiles c ON c.id = m.caterer_id
+        """)
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        op.drop_index('ix_menu_item_search_document', table_name='menu_item_search')
+        op.drop_table('menu_item_search')
+
+    elif bind.dialect.name == 'sqlite':
+        op.execute("DROP TABLE menu_items_fts")
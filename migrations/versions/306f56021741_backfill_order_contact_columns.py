@@ -0,0 +1,161 @@
+"""Backfill order contact columns from notes
+
+Revision ID: 306f56021741
+Revises: a3be7e26891b
+Create Date: 2026-10-16 16:24:51.093716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '306f56021741'
+down_revision = 'a3be7e26891b'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Line prefixes written into orders.notes before the structured columns existed
+NOTES_PREFIXES = ('EVENT', 'TYPE', 'DATE', 'GUESTS', 'DELIVERY', 'CLIENT', 'EMAIL', 'PHONE',
+                  'DIETARY', 'REQUIREMENTS', 'NOTES')
+
+orders = sa.table(
+    'orders',
+    sa.column('id', sa.Integer),
+    sa.column('notes', sa.Text),
+    sa.column('event_name', sa.String),
+    sa.column('event_date', sa.Date),
+    sa.column('event_time', sa.Time),
+    sa.column('guest_count', sa.Integer),
+    sa.column('event_type', sa.String),
+    sa.column('delivery_address', sa.Text),
+    sa.column('special_requirements', sa.JSON),
+    sa.column('contact_name', sa.String),
+    sa.column('contact_email', sa.String),
+    sa.column('contact_phone', sa.String),
+    sa.column('dietary_requirements', sa.JSON),
+)
+
+
+def _split_prefix(line):
+    prefix, separator, value = line.partition(':')
+    if separator and prefix in NOTES_PREFIXES:
+        return prefix, value.strip()
+    return None, line
+
+
+def _parse_notes(notes):
+    """{prefix: value} of a packed notes blob, None if the notes are free text"""
+    lines = notes.split('\n')
+    if _split_prefix(lines[0])[0] is None:
+        return None
+
+    fields = {}
+    current = None
+    for line in lines:
+        prefix, value = (None, line) if current == 'NOTES' else _split_prefix(line)
+        if prefix:
+            current = prefix
+            fields[current] = value
+        else:
+            # Continuation of a multi-line value (everything after NOTES: belongs to the notes)
+            fields[current] = f"{fields[current]}\n{value}"
+    return fields
+
+
+def _split_list(value):
+    return [part.strip() for part in (value or '').split(',') if part.strip()]
+
+
+def _clip(value, length):
+    return value[:length] if value else None
+
+
+def upgrade():
+    # Rows still holding a packed blob have dietary_requirements NULL, parsed rows get a list.
+    # Updates commit as they go, so an interrupted run resumes where it stopped.
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        last_id = 0
+        while True:
+            rows = bind.execute(
+                sa.select(orders.c.id, orders.c.notes, orders.c.event_type, orders.c.delivery_address,
+                          orders.c.special_requirements)
+                .where(orders.c.id > last_id, orders.c.dietary_requirements.is_(None))
+                .order_by(orders.c.id)
+                .limit(BACKFILL_BATCH_SIZE)
+            ).fetchall()
+            if not rows:
+                break
+
+            for row in rows:
+                fields = _parse_notes(row.notes) if row.notes else None
+                values = {'dietary_requirements': _split_list((fields or {}).get('DIETARY'))}
+                if fields is not None:
+                    values.update({
+                        'contact_name': _clip(fields.get('CLIENT'), 150),
+                        'contact_email': _clip(fields.get('EMAIL'), 120),
+                        'contact_phone': _clip(fields.get('PHONE'), 30),
+                        'notes': fields.get('NOTES') or None,
+                    })
+                    if not row.event_type and fields.get('TYPE'):
+                        values['event_type'] = _clip(fields['TYPE'], 50)
+                    if not row.delivery_address and fields.get('DELIVERY'):
+                        values['delivery_address'] = fields['DELIVERY']
+                    if not row.special_requirements and fields.get('REQUIREMENTS'):
+                        values['special_requirements'] = _split_list(fields['REQUIREMENTS'])
+
+                bind.execute(orders.update().where(orders.c.id == row.id).values(values))
+
+            last_id = rows[-1].id
+
+
+def downgrade():
+    # Pack the columns back into notes the way orders were written before
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(orders)
+            .where(orders.c.id > last_id, orders.c.dietary_requirements.isnot(None))
+            .order_by(orders.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        for row in rows:
+            if row.event_name:
+                notes_parts = [
+                    f"EVENT: {row.event_name}",
+                    f"TYPE: {row.event_type or ''}",
+                    f"DATE: {row.event_date or ''} at {row.event_time.strftime('%H:%M') if row.event_time else ''}",
+                    f"GUESTS: {row.guest_count or ''}",
+                    f"DELIVERY: {row.delivery_address or ''}",
+                    f"CLIENT: {row.contact_name or ''}",
+                    f"EMAIL: {row.contact_email or ''}",
+                    f"PHONE: {row.contact_phone or ''}",
+                    f"REQUIREMENTS: {', '.join(row.special_requirements or [])}",
+                    f"NOTES: {row.notes or ''}"
+                ]
+            else:
+                notes_parts = [
+                    f"CLIENT: {row.contact_name or ''}",
+                    f"EMAIL: {row.contact_email or ''}",
+                    f"PHONE: {row.contact_phone or ''}",
+                    f"DELIVERY: {row.delivery_address or ''}",
+                    f"DIETARY: {', '.join(row.dietary_requirements or [])}",
+                    f"NOTES: {row.notes or ''}"
+                ]
+            notes = "\n".join([part for part in notes_parts[:-1] if part.split(': ', 1)[1]])
+            if notes:
+                notes = "\n".join([notes, notes_parts[-1]]) if row.notes else notes
+            else:
+                # Nothing was packed with these notes, they stay free text
+                notes = row.notes
+            bind.execute(orders.update().where(orders.c.id == row.id)
+                         .values(notes=notes or None, dietary_requirements=sa.null()))
+
+        last_id = rows[-1].id
@@ -0,0 +1,83 @@
+"""Add menu_item_dietary_tags table
+
+Revision ID: 80200d6c8e2a
+Revises: 2db4e70070c2
+Create Date: 2026-10-16 10:03:17.540926
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '80200d6c8e2a'
+down_revision = '2db4e70070c2'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _normalize_tags(tags):
+    if isinstance(tags, str):
+        try:
+            tags = json.loads(tags)
+        except ValueError:
+            return []
+    if not isinstance(tags, list):
+        return []
+
+    normalized = []
+    for tag in tags:
+        if isinstance(tag, str):
+            tag = tag.strip().lower()[:50]
+            if tag and tag not in normalized:
+                normalized.append(tag)
+    return normalized
+
+
+def upgrade():
+    op.create_table('menu_item_dietary_tags',
+    sa.Column('menu_item_id', sa.Integer(), nullable=False),
+    sa.Column('tag', sa.String(length=50), nullable=False),
+    sa.ForeignKeyConstraint(['menu_item_id'], ['menu_items.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('menu_item_id', 'tag')
+    )
+    with op.batch_alter_table('menu_item_dietary_tags', schema=None) as batch_op:
+        batch_op.create_index('ix_menu_item_dietary_tags_tag', ['tag', 'menu_item_id'], unique=False)
+
+    # Backfill from menu_items.dietary_tags in id order, one batch at a time
+    bind = op.get_bind()
+    menu_items = sa.table('menu_items', sa.column('id', sa.Integer), sa.column('dietary_tags', sa.Text))
+    dietary_tags = sa.table('menu_item_dietary_tags', sa.column('menu_item_id', sa.Integer),
+                            sa.column('tag', sa.String))
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(menu_items.c.id, menu_items.c.dietary_tags)
+            .where(menu_items.c.id > last_id)
+            .order_by(menu_items.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        tag_rows = [
+            {'menu_item_id': item_id, 'tag': tag}
+            for item_id, tags in rows
+            for tag in _normalize_tags(tags)
+        ]
+        if tag_rows:
+            bind.execute(dietary_tags.insert(), tag_rows)
+
+        last_id = rows[-1][0]
+
+
+def downgrade():
+    with op.batch_alter_table('menu_item_dietary_tags', schema=None) as batch_op:
+        batch_op.drop_index('ix_menu_item_dietary_tags_tag')
+
+    op.drop_table('menu_item_dietary_tags')
@@ -0,0 +1,66 @@
+# tests/conftest.py
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from config import Config
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    RESPONSE_CACHE_BACKEND = "null"  # every request reaches the database
+    CART_STORE_BACKEND = "memory"
+    IMAGE_PROCESSING_MODE = "sync"
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        # Created by the search migration, not by create_all()
+        db.session.execute(db.text(
+            "CREATE VIRTUAL TABLE menu_items_fts USING fts5(name, description, business_name)"
+        ))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def count_queries(app):
+    """
+    Context manager counting the SQL statements run inside it:
+        with count_queries() as queries: ...
+        assert queries.count == 3
+    Starts from an empty session, as a request would, so nothing loaded while seeding is reused.
+    """
+    class Counter:
+        count = 0
+
+    @contextmanager
+    def counting():
+        db.session.remove()
+        counter = Counter()
+
+        def before_cursor_execute(*args):
+            counter.count += 1
+
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield counter
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+    return counting
+
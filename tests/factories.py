@@ -0,0 +1,24 @@
+# tests/factories.py
+from flask_jwt_extended import create_access_token
+
+from app.extensions import db
+from app.models import CatererProfile, User, UserRole
+
+
+def make_user(email, role):
+    user = User(email=email, password_hash="!", role=role)
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+def make_caterer(email="caterer@example.com", business_name="Test Caterer"):
+    user = make_user(email, UserRole.CATERER)
+    profile = CatererProfile(user_id=user.id, business_name=business_name)
+    db.session.add(profile)
+    db.session.flush()
+    return user, profile
+
+
+def auth_headers(user):
+    return {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
@@ -0,0 +1,43 @@
+# tests/test_menu_batch.py
+import pytest
+
+from app.extensions import db
+from app.models import MenuItem
+from tests.factories import auth_headers, make_caterer
+
+
+@pytest.fixture
+def caterer(app):
+    user, profile = make_caterer()
+    db.session.add_all([
+        MenuItem(caterer_id=profile.id, name=f"Item {n}", price=10, is_active=True, is_trending=True)
+        for n in range(2)
+    ])
+    db.session.commit()
+    return user
+
+
+@pytest.mark.parametrize("value", [None, "banana", 1, "yes"])
+def test_batch_rejects_non_boolean_flags(client, caterer, value):
+    ids = [item.id for item in MenuItem.query.order_by(MenuItem.id)]
+    response = client.patch("/api/menu/items/batch", headers=auth_headers(caterer), json={
+        "updates": [{"id": ids[0], "is_active": False}, {"id": ids[1], "is_trending": value}]
+    })
+
+    assert response.status_code == 400
+    assert response.get_json()["errors"] == [
+        {"index": 1, "id": ids[1], "error": "is_trending must be true or false"}
+    ]
+    db.session.expire_all()
+    assert all(item.is_active and item.is_trending for item in MenuItem.query)
+
+
+def test_batch_accepts_boolean_strings(client, caterer):
+    ids = [item.id for item in MenuItem.query.order_by(MenuItem.id)]
+    response = client.patch("/api/menu/items/batch", headers=auth_headers(caterer), json={
+        "ids": ids, "set": {"is_active": "False", "is_trending": False}
+    })
+
+    assert response.status_code == 200
+    db.session.expire_all()
+    assert not any(item.is_active or item.is_trending for item in MenuItem.query)
@@ -0,0 +1,59 @@
+# tests/test_menu_queries.py
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models import MenuItem
+from tests.factories import auth_headers, make_caterer
+
+MENU_ITEMS = 1000
+
+
+@pytest.fixture
+def caterer(app):
+    user, profile = make_caterer()
+    now = datetime.utcnow()
+    db.session.execute(insert(MenuItem), [
+        {"caterer_id": profile.id, "name": f"Item {n}", "description": "Seeded", "price": 10,
+         "category": "Mains", "dietary_tags": ["vegan"] if n % 2 else [],
+         "is_trending": n % 10 == 0, "is_recommended": n % 7 == 0, "is_active": True,
+         "created_at": now - timedelta(minutes=n)}
+        for n in range(MENU_ITEMS)
+    ])
+    db.session.commit()
+    return user
+
+
+def test_my_menu_items_query_count(client, caterer, count_queries):
+    headers = auth_headers(caterer)
+
+    with count_queries() as queries:
+        response = client.get("/api/menu/items", headers=headers)
+
+    assert response.status_code == 200
+    assert response.get_json()["total"] == MENU_ITEMS
+    # user, caterer profile, ETag fingerprint, menu items: no query per item
+    assert queries.count == 4
+
+
+def test_public_menu_items_query_count(client, caterer, count_queries):
+    with count_queries() as queries:
+        response = client.get("/api/menu/public/items?limit=100")
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert len(body["all_items"]) == 100
+    assert body["next_cursors"]["all_items"]
+    # ranked kinds, then one page query per section
+    assert queries.count == 4
+
+
+def test_public_menu_items_query_count_with_sparse_fields(client, caterer, count_queries):
+    with count_queries() as queries:
+        response = client.get("/api/menu/public/items?section=all_items&fields=id,name,price")
+
+    assert response.status_code == 200
+    assert set(response.get_json()["all_items"][0]) == {"id", "name", "price"}
+    assert queries.count == 2
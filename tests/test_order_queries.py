@@ -0,0 +1,71 @@
+# tests/test_order_queries.py
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models import MenuItem, Order, OrderItem, OrderStatus, UserRole
+from tests.factories import auth_headers, make_caterer, make_user
+
+ORDERS = 120
+ITEMS_PER_ORDER = 3
+
+
+@pytest.fixture
+def users(app):
+    client_user = make_user("client@example.com", UserRole.CLIENT)
+    caterer_user, profile = make_caterer()
+    menu_item = MenuItem(caterer_id=profile.id, name="Item", price=10)
+    db.session.add(menu_item)
+    db.session.flush()
+
+    now = datetime.utcnow()
+    statuses = [OrderStatus.PENDING, OrderStatus.CONFIRMED, OrderStatus.COMPLETED]
+    db.session.execute(insert(Order), [
+        {"id": n + 1, "order_number": f"ORD{n + 1}", "client_id": client_user.id, "caterer_id": profile.id,
+         "status": statuses[n % len(statuses)], "total_amount": 30, "item_count": ITEMS_PER_ORDER,
+         "created_at": now - timedelta(minutes=n // 2)}  # pairs share a timestamp
+        for n in range(ORDERS)
+    ])
+    db.session.execute(insert(OrderItem), [
+        {"order_id": order_id, "menu_item_id": menu_item.id, "quantity": 1, "unit_price": 10}
+        for order_id in range(1, ORDERS + 1) for _ in range(ITEMS_PER_ORDER)
+    ])
+    db.session.commit()
+    return {"client": auth_headers(client_user), "caterer": auth_headers(caterer_user)}
+
+
+def _count(client, count_queries, headers, url):
+    with count_queries() as queries:
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    return queries.count, response.get_json()
+
+
+@pytest.mark.parametrize("role, expected_queries", [("client", 4), ("caterer", 5)])
+def test_order_list_page_mode_query_count(client, users, count_queries, role, expected_queries):
+    small, small_body = _count(client, count_queries, users[role], "/api/order/?per_page=5")
+    large, large_body = _count(client, count_queries, users[role], "/api/order/?per_page=50")
+
+    assert len(small_body["orders"]) == 5
+    assert len(large_body["orders"]) == 50
+    assert large_body["total"] == ORDERS
+    # user (JWT loader and view), caterer profile, one page query, COUNT: independent of the page size
+    assert small == large == expected_queries
+
+
+@pytest.mark.parametrize("role, expected_queries", [("client", 3), ("caterer", 4)])
+def test_order_list_cursor_mode_query_count(client, users, count_queries, role, expected_queries):
+    small, small_body = _count(client, count_queries, users[role], "/api/order/?pagination=cursor&limit=5")
+    large, large_body = _count(client, count_queries, users[role], "/api/order/?pagination=cursor&limit=50")
+    next_page, next_body = _count(
+        client, count_queries, users[role], f"/api/order/?limit=50&cursor={large_body['next_cursor']}"
+    )
+
+    assert len(small_body["orders"]) == 5
+    assert len(large_body["orders"]) == 50
+    assert len(next_body["orders"]) == 50
+    assert not {order["id"] for order in large_body["orders"]} & {order["id"] for order in next_body["orders"]}
+    # user (JWT loader and view), caterer profile, one page query, no COUNT
+    assert small == large == next_page == expected_queries
@@ -0,0 +1,49 @@
+# tests/test_order_stats.py
+from decimal import Decimal
+
+import pytest
+
+from app.extensions import db
+from app.models import CatererDailyStats, Order, OrderStatus, UserRole
+from app.utils.order_stats import rebuild_caterer_daily_stats, record_order_stats_change
+from tests.factories import auth_headers, make_caterer, make_user
+
+
+@pytest.fixture
+def order(app):
+    client_user = make_user("client@example.com", UserRole.CLIENT)
+    caterer_user, profile = make_caterer()
+    order = Order(order_number="ORD1", client_id=client_user.id, caterer_id=profile.id,
+                  status=OrderStatus.PENDING, total_amount=100)
+    db.session.add(order)
+    db.session.flush()
+    record_order_stats_change(None, order)
+    db.session.commit()
+    return {"id": order.id, "headers": auth_headers(caterer_user)}
+
+
+def _revenue():
+    return sum(row.revenue for row in CatererDailyStats.query)
+
+
+def test_final_total_rollup_matches_rebuild(client, order):
+    for final_total in ("99.999", "100.004", 99.995):
+        response = client.patch(f"/api/order/{order['id']}/details", headers=order["headers"],
+                                json={"final_total": final_total})
+        assert response.status_code == 200
+
+    db.session.expire_all()
+    assert _revenue() == Decimal("100.00")
+    rebuild_caterer_daily_stats()
+    assert _revenue() == Decimal("100.00")
+
+
+@pytest.mark.parametrize("final_total", ["abc", -1, "1e12", [5]])
+def test_invalid_final_total_rejected(client, order, final_total):
+    response = client.patch(f"/api/order/{order['id']}/details", headers=order["headers"],
+                            json={"final_total": final_total, "status": "confirmed"})
+
+    assert response.status_code == 400
+    db.session.expire_all()
+    assert db.session.get(Order, order["id"]).status == OrderStatus.PENDING
+    assert _revenue() == Decimal("100.00")
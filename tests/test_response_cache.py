@@ -0,0 +1,97 @@
+# tests/test_response_cache.py
+import pytest
+
+from app.extensions import db
+from app.models import MenuItem
+from app.utils.cache import FileCacheBackend, MemoryCacheBackend, bump_catalogue_version
+from tests.factories import auth_headers, make_caterer
+
+
+@pytest.fixture
+def memory_backend(app):
+    backend = MemoryCacheBackend()
+    app.extensions["response_cache"] = backend
+    return backend
+
+
+@pytest.fixture
+def file_backend(app, tmp_path):
+    backend = FileCacheBackend(str(tmp_path))
+    app.extensions["response_cache"] = backend
+    return backend
+
+
+def test_cache_key_escapes_query_values(client, memory_backend):
+    first = client.get("/api/menu/public/items?category=x&section=trending")
+    second = client.get("/api/menu/public/items?category=x%26section%3Dtrending")
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "MISS"
+
+
+def test_no_etag_from_per_process_versions(client, memory_backend):
+    response = client.get("/api/menu/public/items")
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+def test_shared_versions_etag(client, file_backend):
+    etag = client.get("/api/menu/public/items").headers["ETag"]
+    assert client.get("/api/menu/public/items", headers={"If-None-Match": etag}).status_code == 304
+
+    bump_catalogue_version()
+    assert client.get("/api/menu/public/items", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_my_menu_items_etag_follows_rows(client, app, memory_backend):
+    user, profile = make_caterer()
+    item = MenuItem(caterer_id=profile.id, name="Item", price=10)
+    db.session.add(item)
+    db.session.commit()
+    headers = auth_headers(user)
+
+    etag = client.get("/api/menu/items", headers=headers).headers["ETag"]
+    assert client.get("/api/menu/items", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    # Written without bumping this worker's cache version, as another worker would
+    MenuItem.query.filter_by(id=item.id).update({"name": "Renamed", "version": MenuItem.version + 1})
+    db.session.commit()
+    response = client.get("/api/menu/items", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()["menu_items"][0]["name"] == "Renamed"
+
+
+def _quote(client, caterer_id, item_id):
+    return client.post("/api/order/calculate-total", json={
+        "caterer_id": caterer_id, "order_items": [{"menu_item_id": item_id, "quantity": 2}]
+    }).get_json()["estimated_total"]
+
+
+def test_price_tables_use_their_own_namespace(client, app, file_backend, tmp_path):
+    app.extensions["cache_namespaces"]["price-tables"] = FileCacheBackend(str(tmp_path / "price-tables"))
+    _, profile = make_caterer()
+    item = MenuItem(caterer_id=profile.id, name="Item", price=10)
+    db.session.add(item)
+    db.session.commit()
+
+    for quantity in range(1, 20):
+        client.post("/api/order/calculate-total", json={
+            "caterer_id": profile.id, "order_items": [{"menu_item_id": item.id, "quantity": quantity}]
+        })
+
+    assert not list((tmp_path / "entries").iterdir())
+    assert len(list((tmp_path / "price-tables" / "entries").iterdir())) == 1
+
+
+def test_price_tables_not_cached_without_shared_versions(client, memory_backend):
+    _, profile = make_caterer()
+    item = MenuItem(caterer_id=profile.id, name="Item", price=10)
+    db.session.add(item)
+    db.session.commit()
+    assert _quote(client, profile.id, item.id) == 20
+
+    # Changed without bumping this worker's cache version, as another worker would
+    MenuItem.query.filter_by(id=item.id).update({"price": 12})
+    db.session.commit()
+    assert _quote(client, profile.id, item.id) == 24